@@ -10,8 +10,15 @@ importerade filer och transaktioner spåras för att undvika dubblering.
 """
 
 import hashlib
+import json
+import os
 import yaml
 import re
+try:
+    # Snabbare JSON-kodning av hash-filen om orjson finns installerat
+    import orjson
+except ImportError:
+    orjson = None
 from pathlib import Path
 from typing import List, Optional, Tuple
 from datetime import datetime, date
@@ -26,6 +33,65 @@ ACCOUNTS_DB_PATH = Path(__file__).parent.parent / "config" / "accounts.yaml"
 IMPORTS_INDEX_PATH = Path(__file__).parent.parent / "data" / "imports_index.yaml"
 
 
+def _hashes_path() -> Path:
+    """
+    Returnerar sökvägen till JSON-filen med kontonas transaktions-hasher.
+    
+    Hasherna är den helt dominerande delen av kontodatabasen och sparas
+    därför bredvid accounts.yaml i en JSON-fil som kan kodas och avkodas
+    i C, medan den handredigerbara YAML-filen hålls liten.
+    
+    Returns:
+        Sökväg till accounts_hashes.json (följer ACCOUNTS_DB_PATH)
+    """
+    return ACCOUNTS_DB_PATH.with_name(f"{ACCOUNTS_DB_PATH.stem}_hashes.json")
+
+
+def _load_hashes() -> dict:
+    """
+    Läser transaktions-hasherna för alla konton.
+    
+    Returns:
+        Dictionary med kontonamn som nyckel och lista med hasher som värde
+    """
+    path = _hashes_path()
+    if not path.exists():
+        return {}
+    
+    content = path.read_bytes()
+    if orjson is not None:
+        return orjson.loads(content)
+    return json.loads(content)
+
+
+def _save_hashes(hashes: dict) -> None:
+    """
+    Skriver transaktions-hasherna för alla konton.
+    
+    Filen skrivs först till en temporär fil som synkas till disk och
+    sedan byter plats med målfilen via os.replace. En avbruten skrivning
+    lämnar därför den gamla filen orörd i stället för en trunkerad fil
+    som load_accounts inte kan läsa.
+    
+    Args:
+        hashes: Dictionary med kontonamn som nyckel och set med hasher som värde
+    """
+    data = {name: sorted(account_hashes) for name, account_hashes in hashes.items()}
+    if orjson is not None:
+        content = orjson.dumps(data)
+    else:
+        content = json.dumps(data, ensure_ascii=False).encode('utf-8')
+    
+    path = _hashes_path()
+    tmp_path = path.with_suffix(path.suffix + '.tmp')
+    with open(tmp_path, 'wb') as f:
+        f.write(content)
+        f.flush()
+        os.fsync(f.fileno())
+    
+    os.replace(tmp_path, path)
+
+
 def extract_account_from_filename(filename: str) -> str:
     """
     Extraherar kontonamn från filnamn.
@@ -122,14 +188,13 @@ def load_accounts() -> dict:
     try:
         with open(ACCOUNTS_DB_PATH, 'r', encoding='utf-8') as f:
             data = yaml.safe_load(f) or {}
+        hashes = _load_hashes()
         
         accounts = {}
         for account_name, account_data in data.get('accounts', {}).items():
-            # Konvertera transaction_hashes från lista till set
-            if 'transaction_hashes' in account_data:
-                account_data['transaction_hashes'] = set(account_data['transaction_hashes'])
-            else:
-                account_data['transaction_hashes'] = set()
+            # Hasherna ligger i JSON-filen; äldre databaser har dem i YAML-filen
+            account_data['transaction_hashes'] = set(account_data.get('transaction_hashes') or ())
+            account_data['transaction_hashes'].update(hashes.get(account_name, ()))
             
             # Konvertera last_import_date från sträng till datetime om det finns
             if 'last_import_date' in account_data and account_data['last_import_date']:
@@ -143,7 +208,8 @@ def load_accounts() -> dict:
             if 'balance_date' in account_data and account_data['balance_date']:
                 account_data['balance_date'] = date.fromisoformat(account_data['balance_date'])
             
-            accounts[account_name] = Account(**account_data)
+            # Datan har skrivits av save_accounts och är redan konverterad ovan
+            accounts[account_name] = Account.from_trusted(account_data)
         
         return accounts
     except Exception as e:
@@ -158,14 +224,11 @@ def save_accounts(accounts: dict) -> None:
     Args:
         accounts: Dictionary med kontonamn som nyckel och Account-objekt som värde
     """
-    # Konvertera Account-objekt till dictionaries för YAML-serialisering
+    # Konvertera Account-objekt till dictionaries för YAML-serialisering.
+    # Transaktions-hasherna sparas separat i JSON-filen.
     accounts_data = {}
     for account_name, account in accounts.items():
-        account_dict = account.model_dump()
-        
-        # Konvertera set till lista för YAML-serialisering
-        if 'transaction_hashes' in account_dict:
-            account_dict['transaction_hashes'] = list(account_dict['transaction_hashes'])
+        account_dict = account.model_dump(exclude={'transaction_hashes'})
         
         # Konvertera datetime till ISO-format sträng
         if 'last_import_date' in account_dict and account_dict['last_import_date']:
@@ -184,6 +247,9 @@ def save_accounts(accounts: dict) -> None:
     # Skapa config-katalog om den inte finns
     ACCOUNTS_DB_PATH.parent.mkdir(parents=True, exist_ok=True)
     
+    # Spara hasherna först så att YAML-filen aldrig pekar på hasher som saknas
+    _save_hashes({name: account.transaction_hashes for name, account in accounts.items()})
+    
     # Spara till YAML
     with open(ACCOUNTS_DB_PATH, 'w', encoding='utf-8') as f:
         yaml.dump({'accounts': accounts_data}, f, allow_unicode=True, default_flow_style=False)
@@ -372,11 +438,15 @@ def filter_duplicate_transactions(
     Returns:
         Tuple med (nya_transaktioner, dubbletter)
     """
+    # Ladda kontodatabasen en gång för hela listan i stället för per transaktion
+    accounts = load_accounts()
+    known_hashes = accounts[account_name].transaction_hashes if account_name in accounts else set()
+    
     new_transactions = []
     duplicate_transactions = []
     
     for transaction in transactions:
-        if is_transaction_duplicate(account_name, transaction):
+        if calculate_transaction_hash(transaction) in known_hashes:
             duplicate_transactions.append(transaction)
         else:
             new_transactions.append(transaction)
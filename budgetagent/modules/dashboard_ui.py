@@ -45,16 +45,20 @@ def cleanup_demo_data():
         # Töm income_tracker.yaml  
         income_file = config_dir / "income_tracker.yaml"
         income_file.write_text("income_tracker:\n  incomes: []\n  people: []\n", encoding='utf-8')
+        income_log = config_dir / "incomes.jsonl"
+        if income_log.exists():
+            income_log.unlink()
         
         # Töm forecast_engine.yaml
         forecast_file = config_dir / "forecast_engine.yaml"
         forecast_file.write_text("forecast_engine:\n  history_window_months: 6\n  categories: []\n  future_income: []\n  future_bills: []\n", encoding='utf-8')
         
-        # Ta bort transaktionsfil
+        # Ta bort transaktionsfiler (CSV eller Parquet)
         data_dir = Path(__file__).parent.parent / "data"
-        transactions_file = data_dir / "transactions.csv"
-        if transactions_file.exists():
-            transactions_file.unlink()
+        for name in ("transactions.csv", "transactions.parquet"):
+            transactions_file = data_dir / name
+            if transactions_file.exists():
+                transactions_file.unlink()
         
         print("✅ Demo-data rensad!")
     except Exception as e:
@@ -0,0 +1,85 @@
+"""
+Modul för cachning av filinläsning per filversion.
+
+En fils version identifieras av nyckeln (sökväg, mtime, storlek). Så länge
+nyckeln är oförändrad återanvänds det inlästa resultatet; när filen skrivs
+om får den en ny nyckel och läses in på nytt vid nästa anrop.
+
+Exempel:
+    @cached_file_loader(maxsize=4)
+    def _load_rules(path_str: str) -> Dict:
+        with open(path_str, 'r', encoding='utf-8') as f:
+            return yaml.load(f, Loader=SafeLoader) or {}
+
+    rules = _load_rules(CONFIG_PATH)
+    _load_rules.cache_clear()  # efter att filen skrivits
+"""
+
+import os
+from functools import lru_cache, wraps
+from pathlib import Path
+from typing import Any, Callable, Optional, Tuple, Union
+
+
+# Cachenyckel för en filversion: (sökväg, mtime i nanosekunder, storlek i bytes)
+FileKey = Tuple[str, int, int]
+
+
+def file_key(path: Union[str, Path]) -> Optional[FileKey]:
+    """
+    Returnerar cachenyckeln (sökväg, mtime, storlek) för en fil.
+    
+    Args:
+        path: Sökväg till filen
+    
+    Returns:
+        Tuple med sökväg, mtime i nanosekunder och storlek, eller None om
+        filen inte finns
+    """
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return None
+    
+    return (str(path), st.st_mtime_ns, st.st_size)
+
+
+def cached_file_loader(maxsize: int = 4) -> Callable[[Callable[[str], Any]], Callable]:
+    """
+    Dekorator som cachar en inläsningsfunktion per filversion.
+    
+    Den dekorerade funktionen tar sökvägen som sträng och läser filen.
+    Den returnerade funktionen tar en sökväg (str eller Path), slår upp
+    filens nyckel och anropar inläsningen bara när nyckeln är ny. Resultatet
+    delas mellan anrop och får inte muteras.
+    
+    Den returnerade funktionen har även attributen:
+        for_key(key): Hämtar resultatet för en nyckel från file_key()
+        cache_clear(): Tömmer cachen. Anropas efter skrivningar, eftersom
+            mtime kan ha grov upplösning och en ändring med samma
+            filstorlek annars inte skulle märkas.
+    
+    Args:
+        maxsize: Maximalt antal filversioner som hålls i cachen
+    
+    Returns:
+        Dekorator för inläsningsfunktioner
+    
+    Raises:
+        FileNotFoundError: Från den dekorerade funktionen om filen inte finns
+    """
+    def decorator(loader: Callable[[str], Any]) -> Callable:
+        @lru_cache(maxsize=maxsize)
+        def for_key(key: FileKey) -> Any:
+            return loader(key[0])
+        
+        @wraps(loader)
+        def load(path: Union[str, Path]) -> Any:
+            st = os.stat(path)
+            return for_key((str(path), st.st_mtime_ns, st.st_size))
+        
+        load.for_key = for_key
+        load.cache_clear = for_key.cache_clear
+        return load
+    
+    return decorator
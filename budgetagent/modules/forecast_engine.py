@@ -236,13 +236,13 @@ def compare_scenarios(scenarios: List[Scenario]) -> Dict[str, List[ForecastData]
         for forecast_data in forecast:
             # Applicera inkomstjusteringar
             for person, adjustment in scenario.income_adjustments.items():
-                forecast_data.income += adjustment
-                forecast_data.balance += adjustment
+                forecast_data.income += float(adjustment)
+                forecast_data.balance += float(adjustment)
             
             # Applicera utgiftsjusteringar
             for category, adjustment in scenario.expense_adjustments.items():
-                forecast_data.expenses += adjustment
-                forecast_data.balance -= adjustment
+                forecast_data.expenses += float(adjustment)
+                forecast_data.balance -= float(adjustment)
         
         results[scenario.name] = forecast
     
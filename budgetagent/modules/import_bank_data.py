@@ -12,9 +12,159 @@ Exempel på YAML-konfiguration (settings_panel.yaml):
         options: ["Swedbank CSV", "SEB Excel", "Revolut JSON"]
 """
 
+import io
+import os
+import importlib.util
+import itertools
 import pandas as pd
-from typing import Optional, List
+from concurrent.futures import ProcessPoolExecutor
+from decimal import Decimal
+from functools import lru_cache
+from pathlib import Path
+from typing import Iterator, Optional, List, Tuple
 from .models import Transaction
+from . import account_manager
+
+
+# Valfria snabbare läsmotorer (pyarrow för CSV, python-calamine för Excel)
+_HAS_PYARROW = importlib.util.find_spec("pyarrow") is not None
+_HAS_CALAMINE = importlib.util.find_spec("python_calamine") is not None
+
+
+# Kombinationer av separator och encoding att testa för CSV-filer.
+# Nordea kan använda komma, tab eller semikolon som separator.
+# Encodings: UTF-8 med BOM eller Windows-1252
+_CSV_ATTEMPTS = [
+    {'sep': ';', 'encoding': 'utf-8-sig'},    # Semikolon (vanlig för svenska Nordea)
+    {'sep': '\t', 'encoding': 'utf-8-sig'},   # Tab
+    {'sep': ',', 'encoding': 'utf-8-sig'},    # Komma
+    {'sep': None, 'encoding': 'utf-8-sig', 'engine': 'python'},  # Auto-detect med python engine
+    {'sep': ';', 'encoding': 'windows-1252'}, # Semikolon med Windows-1252
+    {'sep': '\t', 'encoding': 'windows-1252'}, # Tab med Windows-1252
+]
+
+
+def _read_csv(content: bytes, **kwargs) -> pd.DataFrame:
+    """
+    Läser CSV-data med pyarrow-motorn om den finns installerad.
+    
+    Pyarrow-motorn är flertrådad och betydligt snabbare än standardmotorn.
+    Om pyarrow saknas, eller inte klarar filen, används pandas standardmotor.
+    Varje motor får en egen ström över innehållet, eftersom ett misslyckat
+    försök kan ha läst en delad ström till slutet.
+    
+    Args:
+        content: CSV-filens innehåll
+        **kwargs: Argument som skickas vidare till pd.read_csv
+        
+    Returns:
+        DataFrame med filens innehåll
+    """
+    if _HAS_PYARROW and 'engine' not in kwargs:
+        try:
+            return pd.read_csv(io.BytesIO(content), engine='pyarrow', **kwargs)
+        except Exception:
+            pass
+    return pd.read_csv(io.BytesIO(content), **kwargs)
+
+
+# Filändelser som kan importeras. Inom dessa avgörs filtypen av innehållet,
+# eftersom bankfiler ofta döps om (t.ex. CSV-data i en .txt-fil)
+_SUPPORTED_SUFFIXES = frozenset({'.csv', '.txt', '.xlsx', '.xls', '.json'})
+
+# Antal bytes från filens början som används för att avgöra filtyp
+_SNIFF_BYTES = 4096
+
+# Signaturer för Excel-filer: xlsx (zip-arkiv) och äldre xls (OLE2)
+_EXCEL_MAGIC = (b'PK\x03\x04', b'\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1')
+
+
+def _sniff_kind(head: bytes) -> Optional[str]:
+    """
+    Avgör filtyp utifrån de första bytena i en fil.
+    
+    Args:
+        head: Filens första bytes (upp till _SNIFF_BYTES)
+        
+    Returns:
+        'excel', 'json', 'csv' eller None om innehållet är binärt
+        och inte känns igen
+    """
+    if head.startswith(_EXCEL_MAGIC):
+        return 'excel'
+    
+    text = head.removeprefix(b'\xef\xbb\xbf').lstrip()
+    if text.startswith((b'{', b'[')):
+        return 'json'
+    
+    # Textfiler innehåller inga nollbytes; allt annat behandlas som CSV
+    if b'\x00' in head:
+        return None
+    return 'csv'
+
+
+def _check_file(path: str) -> None:
+    """
+    Kontrollerar att filen finns och inte är tom.
+    
+    Args:
+        path: Sökväg till filen
+        
+    Raises:
+        FileNotFoundError: Om filen inte finns
+        ValueError: Om filen är tom
+    """
+    # Ett enda stat-anrop både för existenskontroll och filstorlek
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        raise FileNotFoundError(f"Filen {path} hittades inte")
+    
+    # Tomma filer kan avvisas direkt utan att anropa pandas
+    if st.st_size == 0:
+        raise ValueError(f"Filen {path} är tom")
+
+
+def _check_suffix(path: str) -> None:
+    """
+    Kontrollerar att filändelsen hör till de format som kan importeras.
+    
+    Args:
+        path: Sökväg till filen
+        
+    Raises:
+        ValueError: Om filändelsen inte stöds
+    """
+    suffix = Path(path).suffix.lower()
+    if suffix not in _SUPPORTED_SUFFIXES:
+        raise ValueError(f"Filformat {suffix} stöds inte. Använd CSV, Excel eller JSON.")
+
+
+def _read_excel(content: bytes) -> pd.DataFrame:
+    """
+    Läser en Excel-fil och tolkar bara de kolumner som behövs.
+    
+    Läsningen sker i två steg: först läses några rader för att få fram
+    rubrikerna och identifiera bankformatet, sedan läses hela bladet med
+    usecols begränsat till formatets källkolumner. För format där alla
+    kolumner kan behövas (Nordea, okänt format) läses hela bladet.
+    python-calamine (Rust) används om den finns, annars openpyxl.
+    
+    Args:
+        content: Excel-filens innehåll
+        
+    Returns:
+        DataFrame med rådata från filen
+    """
+    engine_kwargs = {'engine': 'calamine'} if _HAS_CALAMINE else {}
+    
+    header = pd.read_excel(io.BytesIO(content), nrows=5, **engine_kwargs)
+    bank_format = _detect_format_from_signature(_column_signature(header))
+    usecols = _projected_columns(header.columns, bank_format)
+    if usecols is None:
+        return pd.read_excel(io.BytesIO(content), **engine_kwargs)
+    
+    return pd.read_excel(io.BytesIO(content), usecols=usecols, **engine_kwargs)
 
 
 def load_file(path: str) -> pd.DataFrame:
@@ -27,34 +177,21 @@ def load_file(path: str) -> pd.DataFrame:
     Returns:
         DataFrame med rådata från filen
     """
-    from pathlib import Path
-    
-    file_path = Path(path)
+    _check_file(path)
+    _check_suffix(path)
     
-    if not file_path.exists():
-        raise FileNotFoundError(f"Filen {path} hittades inte")
+    # Läs filen en gång; inom de tillåtna filändelserna avgörs typen av
+    # innehållet eftersom bankfiler ofta döps om (t.ex. CSV-data i en .txt-fil)
+    with open(path, 'rb') as f:
+        content = f.read()
+    kind = _sniff_kind(content[:_SNIFF_BYTES])
     
-    suffix = file_path.suffix.lower()
-    
-    if suffix == '.csv':
-        # Försök olika separatorer och encodings
-        # Nordea kan använda komma, tab eller semikolon som separator
-        # Encodings: UTF-8 med BOM eller Windows-1252
-        
-        # Lista över kombinationer att testa
-        attempts = [
-            {'sep': ';', 'encoding': 'utf-8-sig'},    # Semikolon (vanlig för svenska Nordea)
-            {'sep': '\t', 'encoding': 'utf-8-sig'},   # Tab
-            {'sep': ',', 'encoding': 'utf-8-sig'},    # Komma
-            {'sep': None, 'encoding': 'utf-8-sig', 'engine': 'python'},  # Auto-detect med python engine
-            {'sep': ';', 'encoding': 'windows-1252'}, # Semikolon med Windows-1252
-            {'sep': '\t', 'encoding': 'windows-1252'}, # Tab med Windows-1252
-        ]
-        
+    if kind == 'csv':
+        # Försök olika separatorer och encodings, direkt från minnet
         last_error = None
-        for attempt in attempts:
+        for attempt in _CSV_ATTEMPTS:
             try:
-                df = pd.read_csv(path, **attempt)
+                df = _read_csv(content, **attempt)
                 # Kontrollera att vi fick flera kolumner (inte bara en kolumn med fel separator)
                 if len(df.columns) > 1:
                     return df
@@ -64,20 +201,67 @@ def load_file(path: str) -> pd.DataFrame:
         
         # Om inget fungerade, ge ett informativt felmeddelande
         raise ValueError(f"Kunde inte läsa CSV-fil med någon separator (komma, tab, semikolon). Senaste fel: {str(last_error)}")
-    elif suffix in ['.xlsx', '.xls']:
-        return pd.read_excel(path)
-    elif suffix == '.json':
-        return pd.read_json(path)
+    elif kind == 'excel':
+        return _read_excel(content)
+    elif kind == 'json':
+        return pd.read_json(io.BytesIO(content))
     else:
+        suffix = Path(path).suffix.lower()
         raise ValueError(f"Filformat {suffix} stöds inte. Använd CSV, Excel eller JSON.")
 
 
+# Regler för formatdetektering, i prioritetsordning. Varje regel är
+# (format, kolumner som måste finnas, grupper där minst en kolumn måste
+# finnas, kolumner som inte får finnas). Ett format kan ha flera regler.
+_FORMATS = [
+    # Nordea: Bokföringsdatum/Bokföringsdag, Belopp och antingen Rubrik, Namn
+    # eller Avsändare/Mottagare. Nordea kan ha Saldo, men Saldo utan
+    # Valutadatum och Rubrik tyder på SEB.
+    ("Nordea", frozenset({'belopp'}),
+     (frozenset({'bokföringsdatum', 'bokföringsdag'}),
+      frozenset({'rubrik', 'namn', 'avsändare', 'mottagare'})),
+     frozenset({'saldo'})),
+    ("Nordea", frozenset({'belopp'}),
+     (frozenset({'bokföringsdatum', 'bokföringsdag'}),
+      frozenset({'rubrik', 'namn', 'avsändare', 'mottagare'}),
+      frozenset({'valutadatum', 'rubrik'})),
+     frozenset()),
+    # Swedbank: Datum, Belopp, Beskrivning
+    ("Swedbank", frozenset({'datum', 'belopp', 'beskrivning'}), (), frozenset()),
+    # SEB: Bokföringsdatum, Valuta, Belopp, Saldo
+    ("SEB", frozenset({'bokföringsdatum', 'saldo'}), (), frozenset()),
+    # Revolut: Completed Date, Description, Amount, Currency
+    ("Revolut", frozenset({'completed date'}), (), frozenset()),
+    ("Revolut", frozenset({'description', 'amount', 'currency'}), (), frozenset()),
+    # Generic format med standardkolumner
+    ("Generic", frozenset(),
+     (frozenset({'date', 'datum'}), frozenset({'amount', 'belopp'})),
+     frozenset()),
+]
+
+
+def _column_signature(data: pd.DataFrame) -> frozenset:
+    """
+    Returnerar mängden av gemena kolumnnamn för en DataFrame.
+    
+    Signaturen är hashbar och används som cachenyckel vid formatdetektering.
+    
+    Args:
+        data: DataFrame med rådata
+        
+    Returns:
+        frozenset med kolumnnamnen i gemener
+    """
+    return frozenset(str(col).lower() for col in data.columns)
+
+
 def detect_format(data: pd.DataFrame) -> str:
     """
     Identifierar bankformat (Swedbank, SEB, Revolut, Nordea etc.).
     
     Analyserar strukturen och innehållet i DataFrame för att identifiera
-    vilken bank som har skapat utdraget.
+    vilken bank som har skapat utdraget. Resultatet beror bara på
+    kolumnnamnen och cachas per kolumnsignatur.
     
     Args:
         data: DataFrame med rådata
@@ -88,37 +272,140 @@ def detect_format(data: pd.DataFrame) -> str:
     if data.empty:
         return "Unknown"
     
-    columns = [col.lower() for col in data.columns]
+    return _detect_format_from_signature(_column_signature(data))
+
+
+@lru_cache(maxsize=64)
+def _detect_format_from_signature(columns: frozenset) -> str:
+    """
+    Identifierar bankformat utifrån en kolumnsignatur.
     
-    # Nordea format: Bokföringsdatum, Belopp, och ofta Rubrik eller Avsändare/Mottagare
-    # Nordea använder ofta "Bokföringsdatum" eller "Bokföringsdag" och antingen "Rubrik", "Namn" eller både "Avsändare" och "Mottagare"
-    # Kan även ha "Saldo"-kolumn (till skillnad från SEB som alltid har Saldo)
-    if ('bokföringsdatum' in columns or 'bokföringsdag' in columns) and 'belopp' in columns:
-        # Kontrollera om det är Nordea (har Rubrik, Namn eller Avsändare/Mottagare)
-        if 'rubrik' in columns or 'namn' in columns or ('avsändare' in columns or 'mottagare' in columns):
-            # Nordea kan ha Saldo, men SEB har alltid Saldo + specifik struktur
-            # Om både Saldo och typiska SEB-kolumner finns, är det SEB
-            if not ('saldo' in columns and 'valutadatum' not in columns and 'rubrik' not in columns):
-                return "Nordea"
+    Args:
+        columns: Kolumnnamn i gemener, från _column_signature()
+        
+    Returns:
+        Sträng med banknamn, t.ex. "Swedbank", "SEB", "Revolut", "Nordea"
+    """
+    for name, required, any_of, forbidden in _FORMATS:
+        if required <= columns and columns.isdisjoint(forbidden) and \
+           all(not columns.isdisjoint(group) for group in any_of):
+            return name
     
-    # Swedbank format: Datum, Belopp, Beskrivning
-    if 'datum' in columns and 'belopp' in columns and 'beskrivning' in columns:
-        return "Swedbank"
+    return "Unknown"
+
+
+# Fasta kolumnmappningar per bankformat. Nordea hanteras separat eftersom
+# dess mappning beror på vilka kolumner som finns och är ifyllda.
+_RENAME_BY_FORMAT = {
+    "Swedbank": {
+        'Datum': 'date',
+        'Belopp': 'amount',
+        'Beskrivning': 'description',
+        'Valuta': 'currency'
+    },
+    "SEB": {
+        'Bokföringsdatum': 'date',
+        'Belopp': 'amount',
+        'Mottagare': 'description',
+        'Valuta': 'currency'
+    },
+    "Revolut": {
+        'Completed Date': 'date',
+        'Amount': 'amount',
+        'Description': 'description',
+        'Currency': 'currency'
+    },
+}
+
+# Skiftlägesokänslig mappning för generiska filer (gemena källnamn)
+_GENERIC_RENAME = {
+    'date': 'date', 'datum': 'date',
+    'amount': 'amount', 'belopp': 'amount',
+    'description': 'description', 'beskrivning': 'description', 'rubrik': 'description',
+    'currency': 'currency', 'valuta': 'currency',
+}
+
+
+# Kolumner som extract_balance_info() läser utöver kolumnmappningen
+_BALANCE_COLUMNS_BY_FORMAT = {
+    "SEB": ('Saldo',),
+}
+
+
+def _projected_columns(columns, bank_format: str) -> Optional[List[str]]:
+    """
+    Returnerar de källkolumner som behövs för ett visst bankformat.
     
-    # SEB format: Bokföringsdatum, Valuta, Belopp, Saldo
-    if 'bokföringsdatum' in columns and 'saldo' in columns:
-        return "SEB"
+    Används för att bara tolka nödvändiga kolumner vid inläsning.
+    Nordea returnerar None eftersom saldo kan ligga i valfri kolumn,
+    och okända format returnerar None eftersom all data behålls.
+    
+    Args:
+        columns: Kolumnnamn från filens rubrikrad
+        bank_format: Bankformat identifierat av detect_format()
+        
+    Returns:
+        Lista med kolumnnamn att läsa, eller None för alla kolumner
+    """
+    if bank_format in _RENAME_BY_FORMAT:
+        wanted = set(_RENAME_BY_FORMAT[bank_format])
+        wanted.update(_BALANCE_COLUMNS_BY_FORMAT.get(bank_format, ()))
+        return [col for col in columns if col in wanted]
+    if bank_format == "Generic":
+        return [col for col in columns if str(col).lower() in _GENERIC_RENAME]
+    return None
+
+
+def _nordea_column_mapping(data: pd.DataFrame) -> dict:
+    """
+    Bygger kolumnmappning för Nordea-filer.
     
-    # Revolut format: Completed Date, Description, Amount, Currency
-    if 'completed date' in columns or ('description' in columns and 'amount' in columns and 'currency' in columns):
-        return "Revolut"
+    Nordea kan ha olika kolumnformat:
+    Format 1: Bokföringsdatum, Belopp, Rubrik, Valuta
+    Format 2: Bokföringsdag, Belopp, Avsändare, Mottagare, Namn, Rubrik, Saldo, Valuta
+    där Namn = beskrivning, Saldo = valuta, Rubrik = saldo-belopp
     
-    # Generic format med standardkolumner
-    if any(col in columns for col in ['date', 'datum']) and \
-       any(col in columns for col in ['amount', 'belopp']):
-        return "Generic"
+    Args:
+        data: DataFrame med rådata från Nordea
+        
+    Returns:
+        Dictionary från källkolumn till standardkolumn
+    """
+    column_mapping = {}
+    
+    # Datum-kolumn
+    if 'Bokföringsdatum' in data.columns:
+        column_mapping['Bokföringsdatum'] = 'date'
+    elif 'Bokföringsdag' in data.columns:
+        column_mapping['Bokföringsdag'] = 'date'
+    
+    # Belopp
+    column_mapping['Belopp'] = 'amount'
+    
+    # Beskrivning - prioritera Rubrik om den finns och inte är tom, annars Namn
+    if 'Rubrik' in data.columns and not data['Rubrik'].isna().all():
+        column_mapping['Rubrik'] = 'description'
+    elif 'Namn' in data.columns and not data['Namn'].isna().all():
+        # Format med Namn-kolumn (det är den riktiga beskrivningen)
+        column_mapping['Namn'] = 'description'
+    elif 'Avsändare' in data.columns:
+        column_mapping['Avsändare'] = 'description'
+    elif 'Mottagare' in data.columns:
+        column_mapping['Mottagare'] = 'description'
+    
+    # Valuta - Nordea kan ha Valuta eller Saldo som valuta-kolumn
+    if 'Saldo' in data.columns and 'Valuta' in data.columns:
+        # Använd Saldo-kolumnen om Valuta-kolumnen är tom (NaN)
+        if data['Valuta'].isna().all():
+            column_mapping['Saldo'] = 'currency'
+        else:
+            column_mapping['Valuta'] = 'currency'
+    elif 'Valuta' in data.columns:
+        column_mapping['Valuta'] = 'currency'
+    elif 'Saldo' in data.columns:
+        column_mapping['Saldo'] = 'currency'
     
-    return "Unknown"
+    return column_mapping
 
 
 def normalize_columns(data: pd.DataFrame, format: str) -> pd.DataFrame:
@@ -135,89 +422,56 @@ def normalize_columns(data: pd.DataFrame, format: str) -> pd.DataFrame:
     Returns:
         DataFrame med standardiserade kolumnnamn
     """
-    df = data.copy()
+    lowered = [str(col).lower() for col in data.columns]
+    column_mapping = _column_mapping(data, format, lowered)
+    if column_mapping is None:
+        return data.copy()
     
-    # Mapping av kolumnnamn baserat på format
+    return _apply_column_mapping(data, column_mapping)
+
+
+def _column_mapping(data: pd.DataFrame, format: str, lowered: List[str]) -> Optional[dict]:
+    """
+    Väljer kolumnmappning för ett bankformat.
+    
+    Args:
+        data: DataFrame med rådata
+        format: Bankformat identifierat av detect_format()
+        lowered: Kolumnnamnen i gemener, i samma ordning som data.columns
+        
+    Returns:
+        Dictionary från källkolumn till standardkolumn, eller None för
+        okända format
+    """
     if format == "Nordea":
-        # Nordea kan ha olika kolumnformat
-        # Format 1: Bokföringsdatum, Belopp, Rubrik, Valuta
-        # Format 2: Bokföringsdag, Belopp, Avsändare, Mottagare, Namn, Rubrik, Saldo, Valuta
-        # där Namn = beskrivning, Saldo = valuta, Rubrik = saldo-belopp
-        
-        column_mapping = {}
-        
-        # Datum-kolumn
-        if 'Bokföringsdatum' in df.columns:
-            column_mapping['Bokföringsdatum'] = 'date'
-        elif 'Bokföringsdag' in df.columns:
-            column_mapping['Bokföringsdag'] = 'date'
-        
-        # Belopp
-        column_mapping['Belopp'] = 'amount'
-        
-        # Beskrivning - Nordea har olika varianter
-        # Prioritera Rubrik om den finns och inte är tom, annars Namn
-        if 'Rubrik' in df.columns and not df['Rubrik'].isna().all():
-            column_mapping['Rubrik'] = 'description'
-        elif 'Namn' in df.columns and not df['Namn'].isna().all():
-            # Format med Namn-kolumn (det är den riktiga beskrivningen)
-            column_mapping['Namn'] = 'description'
-        elif 'Avsändare' in df.columns:
-            column_mapping['Avsändare'] = 'description'
-        elif 'Mottagare' in df.columns:
-            column_mapping['Mottagare'] = 'description'
-        
-        # Valuta - Nordea kan ha Valuta eller Saldo som valuta-kolumn
-        if 'Saldo' in df.columns and 'Valuta' in df.columns:
-            # Kontrollera om Valuta-kolumnen är tom (NaN)
-            if df['Valuta'].isna().all():
-                # Använd Saldo-kolumnen istället
-                column_mapping['Saldo'] = 'currency'
-            else:
-                column_mapping['Valuta'] = 'currency'
-        elif 'Valuta' in df.columns:
-            column_mapping['Valuta'] = 'currency'
-        elif 'Saldo' in df.columns:
-            column_mapping['Saldo'] = 'currency'
-    elif format == "Swedbank":
-        column_mapping = {
-            'Datum': 'date',
-            'Belopp': 'amount',
-            'Beskrivning': 'description',
-            'Valuta': 'currency'
+        return _nordea_column_mapping(data)
+    if format in _RENAME_BY_FORMAT:
+        return _RENAME_BY_FORMAT[format]
+    if format == "Generic":
+        # Matcha kolumnnamn skiftlägesokänsligt
+        return {
+            col: _GENERIC_RENAME[col_lower]
+            for col, col_lower in zip(data.columns, lowered)
+            if col_lower in _GENERIC_RENAME
         }
-    elif format == "SEB":
-        column_mapping = {
-            'Bokföringsdatum': 'date',
-            'Belopp': 'amount',
-            'Mottagare': 'description',
-            'Valuta': 'currency'
-        }
-    elif format == "Revolut":
-        column_mapping = {
-            'Completed Date': 'date',
-            'Amount': 'amount',
-            'Description': 'description',
-            'Currency': 'currency'
-        }
-    elif format == "Generic":
-        # Försök hitta kolumner med liknande namn
-        column_mapping = {}
-        for col in df.columns:
-            col_lower = col.lower()
-            if col_lower in ['date', 'datum']:
-                column_mapping[col] = 'date'
-            elif col_lower in ['amount', 'belopp']:
-                column_mapping[col] = 'amount'
-            elif col_lower in ['description', 'beskrivning', 'rubrik']:
-                column_mapping[col] = 'description'
-            elif col_lower in ['currency', 'valuta']:
-                column_mapping[col] = 'currency'
-    else:
-        return df
+    return None
+
+
+def _apply_column_mapping(data: pd.DataFrame, column_mapping: dict) -> pd.DataFrame:
+    """
+    Byter namn på källkolumner och väljer ut standardkolumnerna.
     
-    # Byt namn på kolumnerna
-    df = df.rename(columns=column_mapping)
+    Args:
+        data: DataFrame med rådata
+        column_mapping: Mappning från _column_mapping()
+        
+    Returns:
+        DataFrame med kolumnerna date, amount, description och currency
+        (de som finns)
+    """
+    # Välj bara de källkolumner som behövs innan namnbytet, så att
+    # endast de kolumnerna kopieras i stället för hela rådatan
+    df = data[[col for col in data.columns if col in column_mapping]].rename(columns=column_mapping)
     
     # Säkerställ att valuta finns om den saknas
     if 'currency' not in df.columns:
@@ -228,6 +482,31 @@ def normalize_columns(data: pd.DataFrame, format: str) -> pd.DataFrame:
     return df[available_cols]
 
 
+def detect_and_normalize(data: pd.DataFrame) -> Tuple[str, pd.DataFrame]:
+    """
+    Identifierar bankformat och standardiserar kolumnnamn i ett steg.
+    
+    Motsvarar detect_format() följt av normalize_columns(), men
+    kolumnnamnen gås igenom och görs om till gemener bara en gång.
+    
+    Args:
+        data: DataFrame med rådata
+        
+    Returns:
+        Tuple (bankformat, DataFrame med standardiserade kolumnnamn)
+    """
+    if data.empty:
+        return "Unknown", data.copy()
+    
+    lowered = [str(col).lower() for col in data.columns]
+    bank_format = _detect_format_from_signature(frozenset(lowered))
+    column_mapping = _column_mapping(data, bank_format, lowered)
+    if column_mapping is None:
+        return bank_format, data.copy()
+    
+    return bank_format, _apply_column_mapping(data, column_mapping)
+
+
 def extract_balance_info(raw_data: pd.DataFrame, bank_format: str) -> Optional[tuple]:
     """
     Extraherar saldoinformation från bankdata.
@@ -242,8 +521,6 @@ def extract_balance_info(raw_data: pd.DataFrame, bank_format: str) -> Optional[t
     Returns:
         Tuple (balance, balance_date, currency) eller None om inget saldo hittas
     """
-    from decimal import Decimal
-    
     balance = None
     balance_date = None
     currency = "SEK"
@@ -389,6 +666,249 @@ def extract_balance_info(raw_data: pd.DataFrame, bank_format: str) -> Optional[t
     return None
 
 
+def _frame_to_transactions(normalized_data: pd.DataFrame) -> List[Transaction]:
+    """
+    Konverterar en normaliserad DataFrame till Transaction-objekt.
+    
+    Alla kolumner tolkas kolumnvis i pandas; rader med ogiltigt datum
+    eller belopp (saknas, går inte att tolka eller är noll) filtreras bort
+    med en mask i stället för att fångas som undantag rad för rad. Rader
+    där datum och belopp finns men inte kan tolkas rapporteras.
+    
+    Args:
+        normalized_data: DataFrame från normalize_columns()
+        
+    Returns:
+        Lista med Transaction-objekt
+    """
+    # Rader utan datum, belopp eller beskrivningskolumn kan inte bli transaktioner
+    if not {'date', 'amount', 'description'}.issubset(normalized_data.columns):
+        return []
+    
+    # Parsa datum för hela kolumnen på en gång. format='mixed' tolkar varje
+    # värde för sig, så att en fil med blandade datumformat inte får alla
+    # rader i andra format än det första som NaT
+    dates = pd.to_datetime(normalized_data['date'], errors='coerce', format='mixed')
+    
+    # Belopp med komma som decimaltecken
+    amount_strs = normalized_data['amount'].astype(str).str.replace(',', '.', regex=False)
+    amount_nums = pd.to_numeric(amount_strs, errors='coerce')
+    
+    valid = dates.notna() & amount_nums.notna() & (amount_nums != 0)
+    
+    # Rader utan datum, och rader med giltigt datum men utan belopp, hoppas
+    # över tyst; övriga ogiltiga rader rapporteras
+    has_date = normalized_data['date'].notna() & (normalized_data['date'].astype(str).str.strip() != '')
+    rejected = has_date & ~valid & (dates.isna() | normalized_data['amount'].notna())
+    for idx in normalized_data.index[rejected]:
+        if pd.isna(dates[idx]):
+            reason = 'ogiltigt datum'
+        elif pd.isna(amount_nums[idx]):
+            reason = 'ogiltigt belopp'
+        else:
+            reason = 'belopp kan inte vara noll'
+        print(f"Kunde inte parsa transaktion på rad {idx}: {reason}")
+    
+    # Beskrivning - tomma värden ersätts med en standardtext
+    descriptions = normalized_data['description'].where(
+        normalized_data['description'].notna(), ''
+    ).astype(str).str.strip()
+    descriptions = descriptions.mask(
+        (descriptions == '') | (descriptions.str.lower() == 'nan'), 'Transaktion'
+    )
+    
+    # Valuta - standard SEK om kolumnen saknas eller värdet är tomt
+    if 'currency' in normalized_data.columns:
+        currencies = normalized_data['currency']
+        currencies = currencies.where(
+            currencies.notna() & (currencies.astype(str).str.strip() != ''), 'SEK'
+        ).astype(str)
+    else:
+        currencies = pd.Series('SEK', index=normalized_data.index)
+    
+    # Konvertera alla belopp till Decimal i ett svep; strängrepresentationen
+    # bevaras eftersom den ingår i transaktionshashen för dupliceringsskydd
+    amounts = map(Decimal, amount_strs[valid].tolist())
+    
+    return [
+        Transaction(date=d, amount=a, description=desc, currency=c)
+        for d, a, desc, c in zip(
+            dates[valid].dt.date.to_numpy(),
+            amounts,
+            descriptions[valid].to_numpy(),
+            currencies[valid].to_numpy()
+        )
+    ]
+
+
+def parse_bank_file(file_path: str) -> Tuple[List[Transaction], Optional[tuple]]:
+    """
+    Läser in och konverterar en bankfil utan att röra kontodatabasen.
+    
+    Kombinerar filimport, formatdetektering, saldoextraktion och
+    konvertering till Transaction-objekt. Funktionen har inga sidoeffekter
+    och kan därför köras parallellt i separata processer.
+    
+    Args:
+        file_path: Sökväg till filen att läsa in
+        
+    Returns:
+        Tuple (transaktioner, saldoinformation) där saldoinformation är
+        resultatet från extract_balance_info()
+    """
+    # Ladda fil
+    raw_data = load_file(file_path)
+    
+    # Detektera format och normalisera kolumner
+    bank_format, normalized_data = detect_and_normalize(raw_data)
+    
+    # Extrahera saldoinformation från rådatan
+    balance_info = extract_balance_info(raw_data, bank_format)
+    
+    # Filtrera bort tomma rader (alla värden är NaN)
+    normalized_data = normalized_data.dropna(how='all')
+    
+    # Konvertera till Transaction-objekt
+    transactions = _frame_to_transactions(normalized_data)
+    
+    return transactions, balance_info
+
+
+def _open_csv_chunks(path: str, chunksize: int) -> Tuple[Iterator[pd.DataFrame], pd.DataFrame]:
+    """
+    Öppnar en CSV-fil för läsning i block.
+    
+    Testar samma separatorer och encodings som load_file() och returnerar
+    den första kombinationen som ger mer än en kolumn.
+    
+    Args:
+        path: Sökväg till CSV-filen
+        chunksize: Antal rader per block
+        
+    Returns:
+        Tuple (läsare för återstående block, första blocket)
+    """
+    last_error = None
+    for attempt in _CSV_ATTEMPTS:
+        try:
+            reader = pd.read_csv(path, chunksize=chunksize, **attempt)
+            first_chunk = next(reader)
+        except Exception as e:
+            last_error = e
+            continue
+        if len(first_chunk.columns) > 1:
+            return reader, first_chunk
+        reader.close()
+    
+    raise ValueError(f"Kunde inte läsa CSV-fil med någon separator (komma, tab, semikolon). Senaste fel: {str(last_error)}")
+
+
+def iter_transactions(file_path: str, chunksize: int = 50_000) -> Iterator[Transaction]:
+    """
+    Läser en bankfil och genererar Transaction-objekt block för block.
+    
+    CSV-data läses i block om chunksize rader så att minnesåtgången hålls
+    konstant oavsett filstorlek. Bankformatet och kolumnmappningen
+    bestäms en gång på första blocket. Övriga filformat läses in i sin helhet via
+    parse_bank_file(). Saldoinformation extraheras inte.
+    
+    Args:
+        file_path: Sökväg till filen att läsa in
+        chunksize: Antal rader per block för CSV-filer
+        
+    Yields:
+        Transaction-objekt i filens ordning
+    """
+    _check_file(file_path)
+    _check_suffix(file_path)
+    with open(file_path, 'rb') as f:
+        head = f.read(_SNIFF_BYTES)
+    
+    if _sniff_kind(head) != 'csv':
+        transactions, _ = parse_bank_file(file_path)
+        yield from transactions
+        return
+    
+    reader, first_chunk = _open_csv_chunks(file_path, chunksize)
+    bank_format = detect_format(first_chunk)
+    
+    # Kolumnmappningen kan bero på innehållet (t.ex. Nordeas Rubrik och
+    # Valuta), så den bestäms en gång på första blocket och används för
+    # alla block; annars skulle resultatet bero på chunksize
+    lowered = [str(col).lower() for col in first_chunk.columns]
+    column_mapping = _column_mapping(first_chunk, bank_format, lowered)
+    
+    with reader:
+        for chunk in itertools.chain([first_chunk], reader):
+            if column_mapping is None:
+                normalized_data = chunk.dropna(how='all')
+            else:
+                normalized_data = _apply_column_mapping(chunk, column_mapping).dropna(how='all')
+            yield from _frame_to_transactions(normalized_data)
+
+
+def _register_import(
+    account_name: str,
+    file_path: str,
+    transactions: List[Transaction],
+    balance_info: Optional[tuple]
+) -> List[Transaction]:
+    """
+    Filtrerar dubbletter och registrerar en parsad fil i kontodatabasen.
+    
+    Skriver till accounts.yaml och import-index och måste därför alltid
+    köras i huvudprocessen, en fil i taget.
+    
+    Args:
+        account_name: Kontonamn som filen tillhör
+        file_path: Sökväg till den importerade filen
+        transactions: Transaktioner från parse_bank_file()
+        balance_info: Saldoinformation från parse_bank_file()
+        
+    Returns:
+        Lista med de transaktioner som inte redan fanns för kontot
+    """
+    # Filtrera bort dubbletter av transaktioner
+    new_transactions, duplicates = account_manager.filter_duplicate_transactions(
+        account_name, transactions
+    )
+    
+    if duplicates:
+        print(f"Hittade {len(duplicates)} dubbletter som filtrerades bort")
+    
+    # Registrera de nya transaktionerna
+    if new_transactions:
+        account_manager.register_transactions(account_name, new_transactions)
+    
+    # Uppdatera saldoinformation om tillgänglig
+    if balance_info:
+        balance, balance_date, currency = balance_info
+        account_manager.update_account_balance(account_name, balance, balance_date, currency)
+    
+    # Markera filen som importerad
+    account_manager.add_imported_file(account_name, file_path)
+    
+    # Lägg till i import-index
+    try:
+        filename = Path(file_path).name
+        checksum = account_manager.calculate_file_checksum(file_path)
+        transaction_hashes = [
+            account_manager.calculate_transaction_hash(tx) 
+            for tx in new_transactions
+        ]
+        account_manager.add_import_to_index(
+            filename=filename,
+            checksum=checksum,
+            account=account_name,
+            transaction_count=len(new_transactions),
+            transaction_hashes=transaction_hashes
+        )
+    except Exception as e:
+        print(f"Varning: Kunde inte uppdatera import-index: {e}")
+    
+    return new_transactions
+
+
 def import_and_parse(file_path: str, check_duplicates: bool = True) -> List[Transaction]:
     """
     Importerar och konverterar bankdata till Transaction-objekt.
@@ -404,10 +924,6 @@ def import_and_parse(file_path: str, check_duplicates: bool = True) -> List[Tran
     Returns:
         Lista med Transaction-objekt (endast nya transaktioner om check_duplicates=True)
     """
-    from datetime import datetime
-    from decimal import Decimal
-    from . import account_manager
-    
     # Steg 1: Extrahera kontonamn från filnamn
     account_name = account_manager.extract_account_from_filename(file_path)
     
@@ -416,99 +932,64 @@ def import_and_parse(file_path: str, check_duplicates: bool = True) -> List[Tran
         print(f"Fil {file_path} har redan importerats för konto {account_name}")
         return []
     
-    # Steg 3: Ladda fil
-    raw_data = load_file(file_path)
+    # Steg 3-6: Ladda, detektera, normalisera och konvertera
+    transactions, balance_info = parse_bank_file(file_path)
     
-    # Steg 4: Detektera format
-    bank_format = detect_format(raw_data)
+    # Steg 7: Filtrera bort dubbletter och registrera importen
+    if check_duplicates:
+        return _register_import(account_name, file_path, transactions, balance_info)
     
-    # Steg 4.5: Extrahera saldoinformation innan normalisering
-    balance_info = extract_balance_info(raw_data, bank_format)
+    return transactions
+
+
+def import_many(
+    paths: List[str],
+    check_duplicates: bool = True,
+    max_workers: Optional[int] = None
+) -> List[List[Transaction]]:
+    """
+    Importerar flera bankfiler, med parsning fördelad över flera processer.
     
-    # Steg 5: Normalisera kolumner
-    normalized_data = normalize_columns(raw_data, bank_format)
+    Själva filinläsningen och konverteringen körs parallellt i en
+    ProcessPoolExecutor. Kontrollen av redan importerade filer och all
+    skrivning till kontodatabasen sker däremot i huvudprocessen, en fil
+    i taget och i samma ordning som paths, så att dubbletter mellan
+    filerna i samma batch fortfarande filtreras bort.
     
-    # Filtrera bort tomma rader (alla värden är NaN)
-    normalized_data = normalized_data.dropna(how='all')
+    Args:
+        paths: Sökvägar till filerna att importera
+        check_duplicates: Om True, kontrollera och filtrera bort dubbletter
+        max_workers: Max antal processer (standard: antal CPU-kärnor)
+        
+    Returns:
+        Lista med en transaktionslista per fil, i samma ordning som paths
+    """
+    account_names = [account_manager.extract_account_from_filename(path) for path in paths]
     
-    # Steg 6: Konvertera till Transaction-objekt
-    transactions = []
-    for idx, row in normalized_data.iterrows():
-        try:
-            # Hoppa över rader där datum saknas eller är ogiltigt
-            if pd.isna(row['date']) or str(row['date']).strip() == '':
-                continue
-            
-            # Parsa datum
-            date_val = pd.to_datetime(row['date']).date()
-            
-            # Konvertera belopp till Decimal (hantera komma som decimaltecken)
-            if pd.isna(row['amount']):
-                continue
-            amount_str = str(row['amount']).replace(',', '.')
-            amount_val = Decimal(amount_str)
-            
-            # Beskrivning
-            description = str(row['description']) if not pd.isna(row['description']) else ''
-            if description.strip() == '' or description.lower() == 'nan':
-                description = 'Transaktion'
-            
-            # Valuta
-            currency = row.get('currency', 'SEK')
-            if pd.isna(currency) or str(currency).strip() == '':
-                currency = 'SEK'
-            
-            transaction = Transaction(
-                date=date_val,
-                amount=amount_val,
-                description=description.strip(),
-                currency=str(currency)
-            )
-            transactions.append(transaction)
-        except Exception as e:
-            # Hoppa över transaktioner som inte kan parsas
-            print(f"Kunde inte parsa transaktion på rad {idx}: {e}")
+    # Hoppa över filer som redan har importerats
+    pending = []
+    for path, account_name in zip(paths, account_names):
+        if check_duplicates and account_manager.is_file_imported(account_name, path):
+            print(f"Fil {path} har redan importerats för konto {account_name}")
             continue
+        pending.append(path)
     
-    # Steg 7: Filtrera bort dubbletter av transaktioner
-    if check_duplicates:
-        new_transactions, duplicates = account_manager.filter_duplicate_transactions(
-            account_name, transactions
-        )
-        
-        if duplicates:
-            print(f"Hittade {len(duplicates)} dubbletter som filtrerades bort")
-        
-        # Registrera de nya transaktionerna
-        if new_transactions:
-            account_manager.register_transactions(account_name, new_transactions)
-        
-        # Uppdatera saldoinformation om tillgänglig
-        if balance_info:
-            balance, balance_date, currency = balance_info
-            account_manager.update_account_balance(account_name, balance, balance_date, currency)
-        
-        # Markera filen som importerad
-        account_manager.add_imported_file(account_name, file_path)
-        
-        # Lägg till i import-index
-        try:
-            filename = Path(file_path).name
-            checksum = account_manager.calculate_file_checksum(file_path)
-            transaction_hashes = [
-                account_manager.calculate_transaction_hash(tx) 
-                for tx in new_transactions
-            ]
-            account_manager.add_import_to_index(
-                filename=filename,
-                checksum=checksum,
-                account=account_name,
-                transaction_count=len(new_transactions),
-                transaction_hashes=transaction_hashes
-            )
-        except Exception as e:
-            print(f"Varning: Kunde inte uppdatera import-index: {e}")
+    # Processpoolen lönar sig bara när det finns mer än en fil att parsa
+    if len(pending) > 1:
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            parsed = dict(zip(pending, executor.map(parse_bank_file, pending)))
+    else:
+        parsed = {path: parse_bank_file(path) for path in pending}
+    
+    results = []
+    for path, account_name in zip(paths, account_names):
+        if path not in parsed:
+            results.append([])
+            continue
         
-        return new_transactions
+        transactions, balance_info = parsed[path]
+        if check_duplicates:
+            transactions = _register_import(account_name, path, transactions, balance_info)
+        results.append(transactions)
     
-    return transactions
+    return results
@@ -5,6 +5,9 @@ Denna modul hanterar spårning av inkomster för olika personer i hushållet.
 Den stödjer både återkommande inkomster (t.ex. lön) och engångsinkomster
 (t.ex. frilansuppdrag eller bonus).
 
+Nya inkomster skrivs till en append-only logg (incomes.jsonl) bredvid
+income_tracker.yaml och förs över till YAML-filen vid kompaktering.
+
 Exempel på YAML-konfiguration (income_tracker.yaml):
     income_tracker:
       people:
@@ -19,37 +22,285 @@ Exempel på YAML-konfiguration (income_tracker.yaml):
               date: "2025-12-10"
 """
 
+import copy
+import json
+import os
+import threading
+import pandas as pd
+try:
+    # Snabbare JSON-kodning av inkomstloggen om orjson finns installerat
+    import orjson
+except ImportError:
+    orjson = None
+import yaml
+try:
+    # C-implementerad YAML-parser/emitter när PyYAML är byggt mot libyaml
+    from yaml import CSafeLoader as SafeLoader, CSafeDumper as SafeDumper
+except ImportError:
+    from yaml import SafeLoader, SafeDumper
+from functools import lru_cache
+from pathlib import Path
 from typing import Dict, Optional, List
+from .file_cache import cached_file_loader, file_key
 from .models import Income
 
 
-def add_income(income: Income) -> None:
+# Nya inkomster läggs till i en append-only logg (en JSON-rad per inkomst)
+# i stället för att hela YAML-filen läses in och skrivs om vid varje tillägg.
+# Loggen slås ihop med YAML-filen när den växt förbi _COMPACT_THRESHOLD_BYTES.
+_COMPACT_THRESHOLD_BYTES = 256 * 1024
+
+# Lås som serialiserar skrivningar till loggen och YAML-filen
+_WRITE_LOCK = threading.Lock()
+
+# Global sökväg till inkomstkonfigurationen
+CONFIG_PATH = Path(__file__).resolve().parent.parent / "config" / "income_tracker.yaml"
+
+# Global sökväg till append-only loggen med nya inkomster
+INCOME_LOG_PATH = CONFIG_PATH.parent / "incomes.jsonl"
+
+
+def _dumps_line(record: Dict) -> bytes:
     """
-    Sparar inkomst i YAML.
+    Kodar en inkomst som en UTF-8-kodad JSON-rad.
     
-    Registrerar en ny inkomst för en person och sparar den i
-    YAML-konfigurationsfilen.
+    Args:
+        record: Inkomst-dictionary
+        
+    Returns:
+        JSON-raden inklusive avslutande radbrytning
+    """
+    if orjson is not None:
+        return orjson.dumps(record) + b'\n'
+    return (json.dumps(record, ensure_ascii=False) + '\n').encode('utf-8')
+
+
+def _loads_line(line: bytes) -> Dict:
+    """
+    Avkodar en JSON-rad från inkomstloggen.
     
     Args:
-        income: Income-objekt med inkomstinformation
+        line: En rad från incomes.jsonl
+        
+    Returns:
+        Inkomst-dictionary
+    """
+    if orjson is not None:
+        return orjson.loads(line)
+    return json.loads(line)
+
+
+@cached_file_loader(maxsize=4)
+def _parse_yaml_file(path_str: str) -> dict:
     """
-    import yaml
-    from pathlib import Path
+    Parsar income_tracker.yaml och säkerställer grundstrukturen.
     
-    config_path = Path(__file__).parent.parent / "config" / "income_tracker.yaml"
+    Cachas per filversion. Det returnerade objektet delas mellan anrop
+    och får inte muteras.
     
-    # Ladda befintlig data
-    if config_path.exists():
-        with open(config_path, 'r', encoding='utf-8') as f:
-            data = yaml.safe_load(f) or {}
-    else:
-        data = {}
+    Args:
+        path_str: Sökväg till YAML-filen
+        
+    Returns:
+        Dictionary med nyckeln income_tracker och en incomes-lista
+    """
+    with open(path_str, 'r', encoding='utf-8') as f:
+        data = yaml.load(f, Loader=SafeLoader) or {}
     
-    if 'income_tracker' not in data:
+    if 'income_tracker' not in data or data['income_tracker'] is None:
         data['income_tracker'] = {'incomes': []}
-    elif 'incomes' not in data['income_tracker']:
+    elif 'incomes' not in data['income_tracker'] or data['income_tracker']['incomes'] is None:
         data['income_tracker']['incomes'] = []
     
+    return data
+
+
+@cached_file_loader(maxsize=4)
+def _parse_log_file(path_str: str) -> List[Dict]:
+    """
+    Parsar append-only loggen, cachad per filversion.
+    
+    Det returnerade objektet delas mellan anrop och får inte muteras.
+    
+    Args:
+        path_str: Sökväg till loggen
+        
+    Returns:
+        Lista med inkomst-dictionaries i den ordning de lades till
+    """
+    with open(path_str, 'rb') as f:
+        return [_loads_line(line) for line in f if line.strip()]
+
+
+def _load_yaml_data() -> dict:
+    """
+    Läser income_tracker.yaml via cachen.
+    
+    Returns:
+        Dictionary med nyckeln income_tracker och en incomes-lista
+        (delad med cachen, får inte muteras)
+    """
+    try:
+        return _parse_yaml_file(CONFIG_PATH)
+    except FileNotFoundError:
+        return {'income_tracker': {'incomes': []}}
+
+
+def _read_income_log() -> List[Dict]:
+    """
+    Läser alla inkomster från append-only loggen via cachen.
+    
+    Returns:
+        Lista med inkomst-dictionaries i den ordning de lades till
+        (delad med cachen, får inte muteras)
+    """
+    try:
+        return _parse_log_file(INCOME_LOG_PATH)
+    except FileNotFoundError:
+        return []
+
+
+def _load_incomes() -> List[Dict]:
+    """
+    Returnerar alla registrerade inkomster.
+    
+    Slår ihop inkomsterna i income_tracker.yaml med de som lagts till
+    i append-only loggen sedan senaste kompaktering.
+    
+    Returns:
+        Lista med inkomst-dictionaries
+    """
+    return _load_yaml_data()['income_tracker']['incomes'] + _read_income_log()
+
+
+@lru_cache(maxsize=4)
+def _build_income_frame(yaml_key: Optional[tuple], log_key: Optional[tuple]) -> pd.DataFrame:
+    """
+    Bygger en DataFrame med alla inkomster, cachad per filversion.
+    
+    Args:
+        yaml_key: Cachenyckel för income_tracker.yaml från file_key()
+        log_key: Cachenyckel för incomes.jsonl från file_key()
+        
+    Returns:
+        DataFrame med en rad per inkomst och kolumnerna person, source,
+        amount, date, month (YYYY-MM), recurring, frequency och category
+        (delad med cachen, får inte muteras)
+    """
+    incomes = []
+    if yaml_key is not None:
+        incomes += _parse_yaml_file.for_key(yaml_key)['income_tracker']['incomes']
+    if log_key is not None:
+        incomes += _parse_log_file.for_key(log_key)
+    
+    df = pd.DataFrame.from_records(
+        incomes,
+        columns=['person', 'source', 'amount', 'date', 'recurring', 'frequency', 'category']
+    )
+    df['amount'] = df['amount'].astype('float64')
+    # Alla datum lagras som ISO-datum (YYYY-MM-DD); ett explicit format och
+    # cache för upprepade strängar undviker tolkning element för element
+    df['date'] = pd.to_datetime(df['date'], format='%Y-%m-%d', cache=True)
+    df['month'] = df['date'].dt.strftime('%Y-%m')
+    df['recurring'] = df['recurring'].fillna(False).astype(bool)
+    
+    # Person och frekvens har få unika värden; som kategorier jämförs
+    # heltalskoder i stället för Python-strängar vid filtrering
+    df = df.astype({'person': 'category', 'frequency': 'category'})
+    
+    return df
+
+
+def _income_frame() -> pd.DataFrame:
+    """
+    Returnerar den cachade inkomst-DataFrame:n för aktuella filer.
+    
+    Returns:
+        DataFrame från _build_income_frame() (får inte muteras)
+    """
+    return _build_income_frame(file_key(CONFIG_PATH), file_key(INCOME_LOG_PATH))
+
+
+def _append_income_jsonl(income_dict: Dict) -> int:
+    """
+    Lägger till en inkomst som en rad i append-only loggen.
+    
+    Args:
+        income_dict: Inkomst i samma format som i income_tracker.yaml
+        
+    Returns:
+        Loggens storlek i bytes efter tillägget
+    """
+    INCOME_LOG_PATH.parent.mkdir(parents=True, exist_ok=True)
+    
+    with open(INCOME_LOG_PATH, 'ab') as f:
+        f.write(_dumps_line(income_dict))
+        return f.tell()
+
+
+def _atomic_write_yaml(path: Path, data: Dict) -> None:
+    """
+    Skriver YAML-data atomärt till en fil.
+    
+    Datan skrivs först till en temporär fil som synkas till disk och
+    sedan byter plats med målfilen via os.replace. Ett avbrott mitt i
+    skrivningen lämnar därför den gamla filen orörd.
+    
+    Args:
+        path: Sökväg till målfilen
+        data: Data att serialisera
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix(path.suffix + '.tmp')
+    
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        yaml.dump(data, f, Dumper=SafeDumper, allow_unicode=True, default_flow_style=False)
+        f.flush()
+        os.fsync(f.fileno())
+    
+    os.replace(tmp_path, path)
+    
+    # Synka katalogen så att namnbytet överlever ett strömavbrott (POSIX)
+    if hasattr(os, 'O_DIRECTORY'):
+        dir_fd = os.open(path.parent, os.O_RDONLY | os.O_DIRECTORY)
+        try:
+            os.fsync(dir_fd)
+        finally:
+            os.close(dir_fd)
+
+
+def _compact_to_yaml() -> None:
+    """
+    Slår ihop append-only loggen med income_tracker.yaml.
+    
+    Inkomsterna i loggen läggs till i YAML-filen, som skrivs om en gång,
+    varefter loggen tas bort.
+    """
+    logged = _read_income_log()
+    
+    if not logged:
+        if INCOME_LOG_PATH.exists():
+            INCOME_LOG_PATH.unlink()
+        return
+    
+    data = copy.deepcopy(_load_yaml_data())
+    data['income_tracker']['incomes'].extend(logged)
+    
+    _atomic_write_yaml(CONFIG_PATH, data)
+    INCOME_LOG_PATH.unlink()
+
+
+def add_income(income: Income) -> None:
+    """
+    Sparar inkomst i YAML.
+    
+    Registrerar en ny inkomst för en person. Inkomsten läggs till i
+    append-only loggen och förs över till YAML-konfigurationsfilen
+    vid nästa kompaktering.
+    
+    Args:
+        income: Income-objekt med inkomstinformation
+    """
     # Konvertera Income till dictionary
     income_dict = {
         'person': income.person,
@@ -61,13 +312,14 @@ def add_income(income: Income) -> None:
         'category': income.category
     }
     
-    # Lägg till inkomsten
-    data['income_tracker']['incomes'].append(income_dict)
-    
-    # Spara tillbaka
-    config_path.parent.mkdir(parents=True, exist_ok=True)
-    with open(config_path, 'w', encoding='utf-8') as f:
-        yaml.dump(data, f, allow_unicode=True, default_flow_style=False)
+    # Serialisera skrivningar från flera trådar (t.ex. Dash-callbacks)
+    with _WRITE_LOCK:
+        # Lägg till inkomsten i loggen
+        log_size = _append_income_jsonl(income_dict)
+        
+        # Kompaktera när loggen har vuxit sig stor
+        if log_size > _COMPACT_THRESHOLD_BYTES:
+            _compact_to_yaml()
 
 
 def get_monthly_income(person: str, month: str) -> float:
@@ -84,54 +336,21 @@ def get_monthly_income(person: str, month: str) -> float:
     Returns:
         Total inkomst i kronor för månaden
     """
-    import yaml
-    from pathlib import Path
-    from datetime import datetime
-    from decimal import Decimal
-    
-    config_path = Path(__file__).parent.parent / "config" / "income_tracker.yaml"
+    df = _income_frame()
+    df = df[df['person'] == person]
     
-    if not config_path.exists():
+    if df.empty:
         return 0.0
     
-    with open(config_path, 'r', encoding='utf-8') as f:
-        data = yaml.safe_load(f) or {}
-    
-    if 'income_tracker' not in data or 'incomes' not in data['income_tracker']:
-        return 0.0
+    # För återkommande inkomster: välj endast den senaste (senaste startdatum <= month) per källa
+    recurring = df[df['recurring'] & (df['month'] <= month)]
+    latest_idx = recurring.groupby('source', sort=False, dropna=False)['date'].idxmax()
+    recurring_total = recurring.loc[latest_idx, 'amount'].sum()
     
-    total = Decimal(0)
+    # Engångsinkomst - inkludera endast om den är exakt denna månad
+    one_time_total = df.loc[~df['recurring'] & (df['month'] == month), 'amount'].sum()
     
-    # För återkommande inkomster: välj endast den senaste (senaste startdatum <= month) per källa
-    from collections import defaultdict
-    recurring_latest = {}
-    one_time_incomes = []
-
-    for income_dict in data['income_tracker']['incomes']:
-        if income_dict['person'] != person:
-            continue
-        income_date = datetime.fromisoformat(income_dict['date']).date()
-        income_month = income_date.strftime('%Y-%m')
-        if income_dict.get('recurring', False):
-            # Endast ta med återkommande inkomster som startat före eller under denna månad
-            if income_month <= month:
-                source = income_dict.get('source')
-                # Om vi redan har en, välj den med senaste datum <= month
-                prev = recurring_latest.get(source)
-                if (prev is None) or (datetime.fromisoformat(income_dict['date']) > datetime.fromisoformat(prev['date'])):
-                    recurring_latest[source] = income_dict
-        else:
-            # Engångsinkomst - inkludera endast om den är exakt denna månad
-            if income_month == month:
-                one_time_incomes.append(income_dict)
-
-    # Summera återkommande inkomster (endast en per källa)
-    for income_dict in recurring_latest.values():
-        total += Decimal(str(income_dict['amount']))
-    # Summera engångsinkomster
-    for income_dict in one_time_incomes:
-        total += Decimal(str(income_dict['amount']))
-    return float(total)
+    return round(float(recurring_total + one_time_total), 2)
 
 
 def forecast_income(months: int) -> List[Income]:
@@ -147,76 +366,66 @@ def forecast_income(months: int) -> List[Income]:
     Returns:
         Lista med prognostiserade Income-objekt per månad och person
     """
-    import yaml
-    from pathlib import Path
-    from datetime import datetime, timedelta
+    from datetime import datetime
     from dateutil.relativedelta import relativedelta
     from decimal import Decimal
     
-    config_path = Path(__file__).parent.parent / "config" / "income_tracker.yaml"
+    df = _income_frame()
     
-    if not config_path.exists():
+    if df.empty or months <= 0:
         return []
     
-    with open(config_path, 'r', encoding='utf-8') as f:
-        data = yaml.safe_load(f) or {}
+    today = datetime.now().date()
+    horizon_end = pd.Timestamp(today + relativedelta(months=months))
     
-    if 'income_tracker' not in data or 'incomes' not in data['income_tracker']:
-        return []
+    # En rad per prognosmånad (samma dag i månaden som idag)
+    forecast_months = pd.DataFrame({
+        'offset': range(months),
+        'forecast_date': pd.to_datetime(
+            [today + relativedelta(months=offset) for offset in range(months)]
+        )
+    })
     
-    forecasted_incomes = []
-    today = datetime.now().date()
+    # Korsprodukt inkomster × prognosmånader, med ursprunglig radordning sparad
+    incomes = df.assign(
+        position=range(len(df)),
+        income_date=df['date'].dt.normalize(),
+        frequency=df['frequency'].astype(object).fillna('monthly')
+    )
+    expanded = incomes.merge(forecast_months, how='cross')
     
-    # Generera prognos för varje månad
-    for month_offset in range(months):
-        forecast_date = today + relativedelta(months=month_offset)
-        
-        # Gå igenom alla inkomster
-        for income_dict in data['income_tracker']['incomes']:
-            income_date = datetime.fromisoformat(income_dict['date']).date()
-            
-            if income_dict.get('recurring', False):
-                # Återkommande inkomst - lägg till för varje månad
-                frequency = income_dict.get('frequency', 'monthly')
-                
-                if frequency == 'monthly':
-                    # Lägg till om startdatum är före eller under prognosmånaden
-                    if income_date <= forecast_date:
-                        forecasted_income = Income(
-                            person=income_dict['person'],
-                            source=income_dict['source'],
-                            amount=Decimal(str(income_dict['amount'])),
-                            date=forecast_date,
-                            recurring=True,
-                            frequency='monthly',
-                            category=income_dict.get('category')
-                        )
-                        forecasted_incomes.append(forecasted_income)
-                elif frequency == 'yearly':
-                    # Lägg endast till om det är samma månad som startmånaden
-                    if income_date.month == forecast_date.month and income_date <= forecast_date:
-                        forecasted_income = Income(
-                            person=income_dict['person'],
-                            source=income_dict['source'],
-                            amount=Decimal(str(income_dict['amount'])),
-                            date=forecast_date,
-                            recurring=True,
-                            frequency='yearly',
-                            category=income_dict.get('category')
-                        )
-                        forecasted_incomes.append(forecasted_income)
-            else:
-                # Engångsinkomst - lägg till endast om den är i framtiden och inom prognosperioden
-                if income_date >= today and income_date <= (today + relativedelta(months=months)):
-                    if income_date.year == forecast_date.year and income_date.month == forecast_date.month:
-                        forecasted_income = Income(
-                            person=income_dict['person'],
-                            source=income_dict['source'],
-                            amount=Decimal(str(income_dict['amount'])),
-                            date=income_date,
-                            recurring=False,
-                            category=income_dict.get('category')
-                        )
-                        forecasted_incomes.append(forecasted_income)
-    
-    return forecasted_incomes
+    income_date = expanded['income_date']
+    forecast_date = expanded['forecast_date']
+    started = income_date <= forecast_date
+    
+    # Återkommande inkomst - varje månad, eller bara startmånaden om årlig
+    monthly = expanded['recurring'] & (expanded['frequency'] == 'monthly') & started
+    yearly = (
+        expanded['recurring'] & (expanded['frequency'] == 'yearly') & started
+        & (income_date.dt.month == forecast_date.dt.month)
+    )
+    
+    # Engångsinkomst - endast om den är i framtiden, inom prognosperioden och i prognosmånaden
+    one_time = (
+        ~expanded['recurring']
+        & (income_date >= pd.Timestamp(today)) & (income_date <= horizon_end)
+        & (income_date.dt.year == forecast_date.dt.year)
+        & (income_date.dt.month == forecast_date.dt.month)
+    )
+    
+    selected = expanded[monthly | yearly | one_time].sort_values(['offset', 'position'])
+    amounts = map(Decimal, selected['amount'].astype(str).tolist())
+    
+    # Inkomsterna validerades när de registrerades; bygg objekten utan omvalidering
+    return [
+        Income.from_trusted({
+            'person': row.person,
+            'source': row.source,
+            'amount': amount,
+            'date': (row.forecast_date if row.recurring else row.income_date).date(),
+            'recurring': row.recurring,
+            'frequency': row.frequency if row.recurring else None,
+            'category': None if pd.isna(row.category) else row.category
+        })
+        for row, amount in zip(selected.itertuples(index=False), amounts)
+    ]
@@ -12,13 +12,40 @@ Modellerna representerar kärnentiteterna:
 - AlertConfig: Konfiguration för varningar och tröskelvärden
 """
 
-from pydantic import BaseModel, Field, field_validator
-from typing import Optional, List, Dict, Literal
+from pydantic import BaseModel, ConfigDict, Field, field_serializer, field_validator, model_validator
+from typing import Optional, List, Dict, Literal, Set
 from datetime import date, datetime
 from decimal import Decimal
 
 
-class Transaction(BaseModel):
+class _TrustedModel(BaseModel):
+    """
+    Basklass för modellerna med stöd för konstruktion utan validering.
+    
+    Data som BudgetAgent själv har skrivit (t.ex. YAML-databaser och
+    cachade inkomster) har redan validerats när den skapades och kan
+    därför byggas om med from_trusted(). Extern indata (bankfiler,
+    PDF-fakturor, formulär) ska fortfarande valideras.
+    """
+    
+    @classmethod
+    def from_trusted(cls, data: Dict):
+        """
+        Skapar en modell från redan validerad data utan att validera om.
+        
+        Fälten måste redan ha rätt typer (t.ex. Decimal och date), eftersom
+        ingen typkonvertering görs. Saknade fält får sina standardvärden.
+        
+        Args:
+            data: Dictionary med fältvärden
+            
+        Returns:
+            Instans av modellen
+        """
+        return cls.model_construct(**data)
+
+
+class Transaction(_TrustedModel):
     """
     Representerar en banktransaktion.
     
@@ -48,9 +75,8 @@ class Transaction(BaseModel):
             raise ValueError('Belopp kan inte vara noll')
         return v
     
-    class Config:
-        """Pydantic configuration."""
-        json_schema_extra = {
+    model_config = ConfigDict(
+        json_schema_extra={
             "example": {
                 "date": "2025-11-15",
                 "amount": -350.50,
@@ -60,9 +86,10 @@ class Transaction(BaseModel):
                 "metadata": {"store": "ICA Maxi", "location": "Linköping"}
             }
         }
+    )
 
 
-class Bill(BaseModel):
+class Bill(_TrustedModel):
     """
     Representerar en kommande faktura eller betalning.
     
@@ -98,18 +125,19 @@ class Bill(BaseModel):
             raise ValueError('Fakturabelopp måste vara positivt')
         return v
     
-    @field_validator('payment_date')
-    @classmethod
-    def payment_date_must_be_after_due_date(cls, v: Optional[date], info) -> Optional[date]:
+    @model_validator(mode='after')
+    def payment_date_must_be_after_due_date(self) -> 'Bill':
         """Validerar att betalningsdatum är efter förfallodatum om angivet."""
-        if v is not None and 'due_date' in info.data:
-            if v < info.data['due_date']:
-                raise ValueError('Betalningsdatum kan inte vara före förfallodatum')
-        return v
+        # Körs en gång på den färdiga modellen, efter att datumen parsats
+        if self.payment_date is not None and self.payment_date < self.due_date:
+            raise ValueError('Betalningsdatum kan inte vara före förfallodatum')
+        return self
     
-    class Config:
-        """Pydantic configuration."""
-        json_schema_extra = {
+    # Oföränderlig, så att upcoming_bills kan dela cachade instanser
+    # mellan anrop; ändringar görs genom att skapa en ny Bill
+    model_config = ConfigDict(
+        frozen=True,
+        json_schema_extra={
             "example": {
                 "name": "Elräkning",
                 "amount": 900,
@@ -120,9 +148,10 @@ class Bill(BaseModel):
                 "paid": False
             }
         }
+    )
 
 
-class Income(BaseModel):
+class Income(_TrustedModel):
     """
     Representerar en inkomst.
     
@@ -156,9 +185,8 @@ class Income(BaseModel):
             raise ValueError('Inkomst måste vara positiv')
         return v
     
-    class Config:
-        """Pydantic configuration."""
-        json_schema_extra = {
+    model_config = ConfigDict(
+        json_schema_extra={
             "example": {
                 "person": "Robin",
                 "source": "Lön",
@@ -168,14 +196,16 @@ class Income(BaseModel):
                 "frequency": "monthly"
             }
         }
+    )
 
 
-class ForecastData(BaseModel):
+class ForecastData(_TrustedModel):
     """
     Representerar prognosdata för ett specifikt datum.
     
     Används av forecast_engine för att lagra simulerade
-    framtida saldon och kassaflöden.
+    framtida saldon och kassaflöden. Beloppen är flyttal eftersom
+    prognosen är en uppskattning; de avrundas till ören vid serialisering.
     
     Attributes:
         date: Datum för prognosen
@@ -186,15 +216,24 @@ class ForecastData(BaseModel):
         confidence: Konfidensnivå för prognosen (0-1)
     """
     date: date
-    balance: Decimal
-    income: Decimal = Decimal(0)
-    expenses: Decimal = Decimal(0)
-    category_breakdown: Dict[str, Decimal] = Field(default_factory=dict)
+    balance: float
+    income: float = 0.0
+    expenses: float = 0.0
+    category_breakdown: Dict[str, float] = Field(default_factory=dict)
     confidence: float = Field(default=0.8, ge=0.0, le=1.0)
     
-    class Config:
-        """Pydantic configuration."""
-        json_schema_extra = {
+    @field_serializer('balance', 'income', 'expenses')
+    def round_to_cents(self, v: float) -> float:
+        """Avrundar belopp till hela ören vid serialisering."""
+        return round(v, 2)
+    
+    @field_serializer('category_breakdown')
+    def round_breakdown_to_cents(self, v: Dict[str, float]) -> Dict[str, float]:
+        """Avrundar belopp per kategori till hela ören vid serialisering."""
+        return {category: round(amount, 2) for category, amount in v.items()}
+    
+    model_config = ConfigDict(
+        json_schema_extra={
             "example": {
                 "date": "2025-12-31",
                 "balance": 15000,
@@ -209,9 +248,10 @@ class ForecastData(BaseModel):
                 "confidence": 0.85
             }
         }
+    )
 
 
-class AlertConfig(BaseModel):
+class AlertConfig(_TrustedModel):
     """
     Konfiguration för varningar och tröskelvärden.
     
@@ -225,13 +265,22 @@ class AlertConfig(BaseModel):
         min_balance_warning: Minimalt saldo som triggar varning
     """
     threshold_percentage: int = Field(default=80, ge=0, le=100)
-    category_limits: Dict[str, Decimal] = Field(default_factory=dict)
+    category_limits: Dict[str, float] = Field(default_factory=dict)
     alert_days_before_due: int = Field(default=7, ge=1)
-    min_balance_warning: Decimal = Field(default=Decimal(1000))
+    min_balance_warning: float = Field(default=1000.0)
+    
+    @field_serializer('min_balance_warning')
+    def round_to_cents(self, v: float) -> float:
+        """Avrundar belopp till hela ören vid serialisering."""
+        return round(v, 2)
+    
+    @field_serializer('category_limits')
+    def round_limits_to_cents(self, v: Dict[str, float]) -> Dict[str, float]:
+        """Avrundar kategorigränser till hela ören vid serialisering."""
+        return {category: round(limit, 2) for category, limit in v.items()}
     
-    class Config:
-        """Pydantic configuration."""
-        json_schema_extra = {
+    model_config = ConfigDict(
+        json_schema_extra={
             "example": {
                 "threshold_percentage": 80,
                 "category_limits": {
@@ -243,9 +292,10 @@ class AlertConfig(BaseModel):
                 "min_balance_warning": 1000
             }
         }
+    )
 
 
-class Scenario(BaseModel):
+class Scenario(_TrustedModel):
     """
     Representerar ett hypotetiskt scenario för jämförelse.
     
@@ -265,9 +315,8 @@ class Scenario(BaseModel):
     expense_adjustments: Dict[str, Decimal] = Field(default_factory=dict)
     one_time_transactions: List[Transaction] = Field(default_factory=list)
     
-    class Config:
-        """Pydantic configuration."""
-        json_schema_extra = {
+    model_config = ConfigDict(
+        json_schema_extra={
             "example": {
                 "name": "Extra inkomst i januari",
                 "description": "Vad händer om vi får 5000 kr extra bonus?",
@@ -276,9 +325,10 @@ class Scenario(BaseModel):
                 "one_time_transactions": []
             }
         }
+    )
 
 
-class Account(BaseModel):
+class Account(_TrustedModel):
     """
     Representerar ett bankkonto i systemet.
     
@@ -299,14 +349,13 @@ class Account(BaseModel):
     account_number: Optional[str] = None
     imported_files: List[Dict[str, str]] = Field(default_factory=list)
     last_import_date: Optional[datetime] = None
-    transaction_hashes: set = Field(default_factory=set)
+    transaction_hashes: Set[str] = Field(default_factory=set)
     current_balance: Optional[Decimal] = None
     balance_date: Optional[date] = None
     balance_currency: str = "SEK"
     
-    class Config:
-        """Pydantic configuration."""
-        json_schema_extra = {
+    model_config = ConfigDict(
+        json_schema_extra={
             "example": {
                 "account_name": "PERSONKONTO 1709 20 72840",
                 "account_number": "1709 20 72840",
@@ -320,3 +369,4 @@ class Account(BaseModel):
                 "balance_currency": "SEK"
             }
         }
+    )
@@ -5,6 +5,10 @@ Denna modul hanterar rättvis fördelning av kvarvarande saldo mellan personer
 i hushållet. Den stödjer olika fördelningsregler som 50/50-delning,
 inkomstbaserad fördelning eller anpassade kvoter.
 
+Fördelningen räknas med flyttal (IEEE 754 binary64) eftersom resultatet
+ändå returneras som float; avrundningsfelen ligger långt under ett öre.
+Exakt decimalaritmetik finns kvar via split_balance(..., high_precision=True).
+
 Exempel på YAML-konfiguration (net_balance_splitter.yaml):
     net_balance_splitter:
       split_rule: "income_weighted"
@@ -14,99 +18,316 @@ Exempel på YAML-konfiguration (net_balance_splitter.yaml):
       shared_expense_categories: ["Boende", "Mat", "Hem"]
 """
 
+import copy
+import sys
+import numpy as np
 import pandas as pd
-from typing import Dict
+import yaml
+try:
+    # C-implementerad YAML-parser/emitter när PyYAML är byggt mot libyaml
+    from yaml import CSafeLoader as SafeLoader, CSafeDumper as SafeDumper
+except ImportError:
+    from yaml import SafeLoader, SafeDumper
+from decimal import Decimal
+from pathlib import Path
+from typing import Dict, Iterable, Optional, Tuple
+from .file_cache import cached_file_loader
+
+
+# Global sökväg till fördelningskonfigurationen
+CONFIG_PATH = Path(__file__).resolve().parent.parent / "config" / "net_balance_splitter.yaml"
+
+
+@cached_file_loader(maxsize=4)
+def _parse_config(path_str: str) -> dict:
+    """
+    Parsar net_balance_splitter.yaml, cachad per filversion.
+    
+    Args:
+        path_str: Sökväg till YAML-filen
+        
+    Returns:
+        Dictionary med konfigurationen (får inte muteras)
+    """
+    with open(path_str, 'r', encoding='utf-8') as f:
+        return yaml.load(f, Loader=SafeLoader) or {}
+
+
+def _load_config() -> dict:
+    """
+    Läser konfigurationen för fördelning via cachen.
+    
+    Returns:
+        Dictionary med konfigurationen, eller tom dictionary om filen
+        saknas (delas med cachen, får inte muteras)
+    """
+    try:
+        return _parse_config(CONFIG_PATH)
+    except FileNotFoundError:
+        return {}
+
+
+# Gemensamma kategorier om inget anges i konfigurationen
+_DEFAULT_SHARED_CATEGORIES = ("Boende", "Mat", "Hem")
+
+
+@cached_file_loader(maxsize=4)
+def _parse_shared_categories(path_str: str) -> Tuple[tuple, frozenset]:
+    """
+    Hämtar gemensamma utgiftskategorier ur konfigurationen.
+    
+    Mängden byggs bara om när filen ändras.
+    
+    Args:
+        path_str: Sökväg till YAML-filen
+        
+    Returns:
+        Tuple (kategorier i konfigurationens ordning, frozenset av kategorierna)
+    """
+    config = _parse_config(path_str)
+    categories = _DEFAULT_SHARED_CATEGORIES
+    if 'net_balance_splitter' in config and 'shared_expense_categories' in config['net_balance_splitter']:
+        categories = tuple(config['net_balance_splitter']['shared_expense_categories'])
+    
+    return categories, frozenset(categories)
 
 
-def split_balance(total_income: Dict, total_expenses: Dict, rule: str) -> Dict:
+def _shared_categories() -> Tuple[tuple, frozenset]:
+    """
+    Returnerar gemensamma utgiftskategorier för aktuell konfiguration.
+    
+    Returns:
+        Tuple (kategorier i konfigurationens ordning, frozenset av kategorierna)
+    """
+    try:
+        return _parse_shared_categories(CONFIG_PATH)
+    except FileNotFoundError:
+        return _DEFAULT_SHARED_CATEGORIES, frozenset(_DEFAULT_SHARED_CATEGORIES)
+
+
+def _equal_weights(income_arr: np.ndarray, expense_arr: np.ndarray, people: tuple) -> np.ndarray:
+    """
+    Andelar för lika fördelning mellan alla personer.
+    
+    Args:
+        income_arr: Inkomst per person
+        expense_arr: Utgifter per person
+        people: Personerna i samma ordning som vektorerna
+        
+    Returns:
+        Vektor med lika andelar
+    """
+    count = len(people)
+    return np.full(count, 1.0 / count) if count else np.empty(0)
+
+
+def _income_weights(income_arr: np.ndarray, expense_arr: np.ndarray, people: tuple) -> Optional[np.ndarray]:
+    """
+    Andelar baserade på inkomst, eller None om ingen har inkomst.
+    
+    Args:
+        income_arr: Inkomst per person
+        expense_arr: Utgifter per person
+        people: Personerna i samma ordning som vektorerna
+        
+    Returns:
+        Vektor med inkomstandelar, eller None
+    """
+    total_in = income_arr.sum()
+    return income_arr / total_in if total_in > 0 else None
+
+
+def _custom_ratio_weights(income_arr: np.ndarray, expense_arr: np.ndarray, people: tuple) -> Optional[np.ndarray]:
+    """
+    Andelar från custom_ratio i YAML, eller None om ingen kvot är sparad.
+    
+    Args:
+        income_arr: Inkomst per person
+        expense_arr: Utgifter per person
+        people: Personerna i samma ordning som vektorerna
+        
+    Returns:
+        Vektor med anpassade andelar, eller None
+    """
+    config = _load_config()
+    if 'net_balance_splitter' not in config or 'custom_ratio' not in config['net_balance_splitter']:
+        return None
+    
+    ratios = config['net_balance_splitter']['custom_ratio']
+    return np.fromiter((float(ratios.get(p, 0)) for p in people), dtype=np.float64, count=len(people))
+
+
+def _needs_weights(income_arr: np.ndarray, expense_arr: np.ndarray, people: tuple) -> Optional[np.ndarray]:
+    """
+    Behovsbaserade andelar (förenklat: efter utgifter), eller None utan utgifter.
+    
+    Args:
+        income_arr: Inkomst per person
+        expense_arr: Utgifter per person
+        people: Personerna i samma ordning som vektorerna
+        
+    Returns:
+        Vektor med utgiftsandelar, eller None
+    """
+    total_exp = expense_arr.sum()
+    return expense_arr / total_exp if total_exp > 0 else None
+
+
+# Fördelningsregler och funktionen som ger respektive andelar.
+# Okända regler använder lika fördelning.
+_RULE_WEIGHTS = {
+    "equal_split": _equal_weights,
+    "income_weighted": _income_weights,
+    "custom_ratio": _custom_ratio_weights,
+    "needs_based": _needs_weights,
+}
+
+
+class SplitterContext:
+    """
+    Fast hushållssammansättning för upprepade anrop till split_balance.
+    
+    Vid t.ex. scenariojämförelser anropas split_balance många gånger för
+    samma personer. Med en kontext byggs personlistan en gång, med
+    internerade namn, i stället för att slås ihop ur inkomst- och
+    utgiftsnycklarna vid varje anrop.
+    
+    Attributes:
+        people: Personerna i hushållet, i fördelningsordning
+    """
+    __slots__ = ('people', '_known')
+    
+    def __init__(self, names: Iterable[str]):
+        """
+        Args:
+            names: Personerna i hushållet
+        """
+        self.people = tuple(dict.fromkeys(sys.intern(name) for name in names))
+        self._known = frozenset(self.people)
+    
+    def check(self, total_income: Dict, total_expenses: Dict) -> None:
+        """
+        Kontrollerar att alla personer i beloppen ingår i hushållet.
+        
+        Args:
+            total_income: Dictionary med total inkomst per person
+            total_expenses: Dictionary med totala utgifter per person
+            
+        Raises:
+            ValueError: Om en person saknas i kontexten
+        """
+        unknown = (total_income.keys() | total_expenses.keys()) - self._known
+        if unknown:
+            raise ValueError(f"Personer saknas i SplitterContext: {sorted(unknown)}")
+
+
+def split_balance(
+    total_income: Dict,
+    total_expenses: Dict,
+    rule: str,
+    high_precision: bool = False,
+    context: Optional[SplitterContext] = None
+) -> Dict:
     """
     Returnerar fördelning per person.
     
     Beräknar hur kvarvarande saldo ska fördelas mellan personer
-    baserat på vald regel.
+    baserat på vald regel. Beräkningen görs vektoriserat med NumPy.
     
     Args:
         total_income: Dictionary med total inkomst per person
         total_expenses: Dictionary med totala utgifter per person
         rule: Fördelningsregel, t.ex. "equal_split", "income_weighted", "custom_ratio"
+        high_precision: Om True, räkna med Decimal i stället för flyttal
+        context: Valfri SplitterContext med hushållets personer; alla i
+            kontexten får en andel även om de saknas i beloppen
         
     Returns:
         Dictionary med fördelat saldo per person
+        
+    Raises:
+        ValueError: Om beloppen innehåller en person som saknas i context
     """
-    import yaml
-    from pathlib import Path
-    from decimal import Decimal
+    if context is not None:
+        context.check(total_income, total_expenses)
+    
+    if high_precision:
+        people = context.people if context is not None else None
+        return _split_balance_decimal(total_income, total_expenses, rule, people)
+    
+    if context is not None:
+        people = context.people
+    else:
+        # Personer i stabil ordning (inkomster först, sedan utgifter)
+        people = tuple(dict.fromkeys([*total_income, *total_expenses]))
+    count = len(people)
+    
+    income_arr = np.fromiter((float(total_income.get(p, 0)) for p in people), dtype=np.float64, count=count)
+    expense_arr = np.fromiter((float(total_expenses.get(p, 0)) for p in people), dtype=np.float64, count=count)
+    
+    remaining = income_arr.sum() - expense_arr.sum()
+    
+    weights = _RULE_WEIGHTS.get(rule, _equal_weights)(income_arr, expense_arr, people)
+    if weights is None:
+        # Regeln saknar underlag, fallback till lika fördelning
+        weights = _equal_weights(income_arr, expense_arr, people)
     
+    return dict(zip(people, (remaining * weights).tolist()))
+
+
+def _split_balance_decimal(
+    total_income: Dict,
+    total_expenses: Dict,
+    rule: str,
+    people: Optional[tuple] = None
+) -> Dict:
+    """
+    Fördelar saldot med Decimal-aritmetik.
+    
+    Långsammare variant av split_balance() för anrop som kräver exakt
+    decimalaritmetik.
+    
+    Args:
+        total_income: Dictionary med total inkomst per person
+        total_expenses: Dictionary med totala utgifter per person
+        rule: Fördelningsregel, se split_balance()
+        people: Personerna att fördela mellan (standard: alla i beloppen)
+        
+    Returns:
+        Dictionary med fördelat saldo per person
+    """
     # Beräkna total inkomst och utgifter
     total_in = sum(Decimal(str(v)) for v in total_income.values())
     total_exp = sum(Decimal(str(v)) for v in total_expenses.values())
     remaining = total_in - total_exp
     
     # Hämta personer
-    people = set(list(total_income.keys()) + list(total_expenses.keys()))
-    
-    distribution = {}
-    
-    if rule == "equal_split":
-        # Dela lika mellan alla personer
-        per_person = remaining / len(people) if people else Decimal(0)
-        for person in people:
-            distribution[person] = float(per_person)
+    if people is None:
+        people = set(list(total_income.keys()) + list(total_expenses.keys()))
     
-    elif rule == "income_weighted":
+    # Andel per person enligt regeln; None betyder lika fördelning
+    ratios = None
+    if rule == "income_weighted":
         # Dela baserat på inkomstandel
         if total_in > 0:
-            for person in people:
-                person_income = Decimal(str(total_income.get(person, 0)))
-                income_ratio = person_income / total_in
-                distribution[person] = float(remaining * income_ratio)
-        else:
-            # Fallback till lika fördelning
-            per_person = remaining / len(people) if people else Decimal(0)
-            for person in people:
-                distribution[person] = float(per_person)
-    
+            ratios = {p: Decimal(str(total_income.get(p, 0))) / total_in for p in people}
     elif rule == "custom_ratio":
         # Använd anpassad kvot från YAML
-        config_path = Path(__file__).parent.parent / "config" / "net_balance_splitter.yaml"
-        if config_path.exists():
-            with open(config_path, 'r', encoding='utf-8') as f:
-                config = yaml.safe_load(f) or {}
-            
-            if 'net_balance_splitter' in config and 'custom_ratio' in config['net_balance_splitter']:
-                ratios = config['net_balance_splitter']['custom_ratio']
-                for person in people:
-                    ratio = Decimal(str(ratios.get(person, 0)))
-                    distribution[person] = float(remaining * ratio)
-            else:
-                # Fallback
-                per_person = remaining / len(people) if people else Decimal(0)
-                for person in people:
-                    distribution[person] = float(per_person)
-        else:
-            # Fallback
-            per_person = remaining / len(people) if people else Decimal(0)
-            for person in people:
-                distribution[person] = float(per_person)
-    
+        config = _load_config()
+        if 'net_balance_splitter' in config and 'custom_ratio' in config['net_balance_splitter']:
+            custom = config['net_balance_splitter']['custom_ratio']
+            ratios = {p: Decimal(str(custom.get(p, 0))) for p in people}
     elif rule == "needs_based":
         # Behovsbaserad fördelning (förenklad: efter utgifter)
         if total_exp > 0:
-            for person in people:
-                person_expenses = Decimal(str(total_expenses.get(person, 0)))
-                expense_ratio = person_expenses / total_exp
-                distribution[person] = float(remaining * expense_ratio)
-        else:
-            # Fallback
-            per_person = remaining / len(people) if people else Decimal(0)
-            for person in people:
-                distribution[person] = float(per_person)
+            ratios = {p: Decimal(str(total_expenses.get(p, 0))) / total_exp for p in people}
     
-    else:
-        # Default: lika fördelning
+    if ratios is None:
+        # Lika fördelning, även som fallback för övriga regler
         per_person = remaining / len(people) if people else Decimal(0)
-        for person in people:
-            distribution[person] = float(per_person)
+        return {person: float(per_person) for person in people}
+    
+    distribution = {person: float(remaining * ratios[person]) for person in people}
     
     return distribution
 
@@ -121,22 +342,13 @@ def apply_custom_ratio(ratio: Dict) -> None:
     Args:
         ratio: Dictionary med fördelningskvoter per person (ska summera till 1.0)
     """
-    import yaml
-    from pathlib import Path
-    
     # Validera att summan är 1.0
     total_ratio = sum(ratio.values())
     if abs(total_ratio - 1.0) > 0.01:
         raise ValueError(f"Summan av kvoter måste vara 1.0, fick {total_ratio}")
     
-    config_path = Path(__file__).parent.parent / "config" / "net_balance_splitter.yaml"
-    
-    # Ladda befintlig konfiguration
-    if config_path.exists():
-        with open(config_path, 'r', encoding='utf-8') as f:
-            config = yaml.safe_load(f) or {}
-    else:
-        config = {}
+    # Ladda befintlig konfiguration (kopia, eftersom den cachade delas)
+    config = copy.deepcopy(_load_config())
     
     # Uppdatera custom_ratio
     if 'net_balance_splitter' not in config:
@@ -145,9 +357,13 @@ def apply_custom_ratio(ratio: Dict) -> None:
     config['net_balance_splitter']['custom_ratio'] = ratio
     
     # Spara tillbaka
-    config_path.parent.mkdir(parents=True, exist_ok=True)
-    with open(config_path, 'w', encoding='utf-8') as f:
-        yaml.dump(config, f, allow_unicode=True, default_flow_style=False)
+    CONFIG_PATH.parent.mkdir(parents=True, exist_ok=True)
+    with open(CONFIG_PATH, 'w', encoding='utf-8') as f:
+        yaml.dump(config, f, Dumper=SafeDumper, allow_unicode=True, default_flow_style=False)
+    
+    # Filen kan ha skrivits om inom samma mtime-upplösning
+    _parse_config.cache_clear()
+    _parse_shared_categories.cache_clear()
 
 
 def calculate_shared_vs_individual(expenses: pd.DataFrame) -> Dict:
@@ -163,38 +379,24 @@ def calculate_shared_vs_individual(expenses: pd.DataFrame) -> Dict:
     Returns:
         Dictionary med separerade gemensamma och individuella utgifter
     """
-    import yaml
-    from pathlib import Path
-    
     if expenses.empty or 'category' not in expenses.columns or 'amount' not in expenses.columns:
         return {'shared': 0.0, 'individual': 0.0}
     
     # Ladda konfiguration för gemensamma kategorier
-    config_path = Path(__file__).parent.parent / "config" / "net_balance_splitter.yaml"
-    shared_categories = ["Boende", "Mat", "Hem"]  # Default
-    
-    if config_path.exists():
-        with open(config_path, 'r', encoding='utf-8') as f:
-            config = yaml.safe_load(f) or {}
-        
-        if 'net_balance_splitter' in config and 'shared_expense_categories' in config['net_balance_splitter']:
-            shared_categories = config['net_balance_splitter']['shared_expense_categories']
-    
-    # Konvertera till absoluta värden
-    expenses_copy = expenses.copy()
-    expenses_copy['abs_amount'] = expenses_copy['amount'].abs()
+    shared_categories, shared_set = _shared_categories()
     
-    # Klassificera utgifter
-    shared_mask = expenses_copy['category'].isin(shared_categories)
-    shared_total = expenses_copy[shared_mask]['abs_amount'].sum()
-    individual_total = expenses_copy[~shared_mask]['abs_amount'].sum()
+    # Summera absoluta belopp per kategori i en enda gruppering; rader utan
+    # kategori behålls som egen grupp och räknas som individuella
+    totals = expenses['amount'].abs().groupby(expenses['category'], sort=False, dropna=False).sum()
+    shared_mask = totals.index.isin(shared_set)
+    individual = totals[~shared_mask]
     
     return {
-        'shared': float(shared_total),
-        'individual': float(individual_total),
-        'shared_categories': shared_categories,
+        'shared': float(totals[shared_mask].sum()),
+        'individual': float(individual.sum()),
+        'shared_categories': list(shared_categories),
         'breakdown': {
-            'shared_by_category': expenses_copy[shared_mask].groupby('category')['abs_amount'].sum().to_dict(),
-            'individual_by_category': expenses_copy[~shared_mask].groupby('category')['abs_amount'].sum().to_dict()
+            'shared_by_category': totals[shared_mask].to_dict(),
+            'individual_by_category': individual[individual.index.notna()].to_dict()
         }
     }
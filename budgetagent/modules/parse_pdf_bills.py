@@ -7,6 +7,7 @@ Extraherad information sparas direkt i upcoming_bills.yaml för vidare användni
 
 Beroenden:
 - pdfplumber för PDF-textextraktion
+- pymupdf (valfritt) för snabbare textextraktion
 - pytesseract (valfritt) för OCR
 - pdf2image (valfri) för bildbaserade fakturor
 
@@ -25,24 +26,281 @@ Output skrivs till upcoming_bills.yaml:
           category: "Boende"
 """
 
-from typing import List, Dict, Optional
+from typing import List, Dict, Iterable, Iterator, Optional, Tuple, Union
 from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+import os
 import re
-from datetime import datetime
-from decimal import Decimal
+import tempfile
+from datetime import date, datetime
+from decimal import Decimal, InvalidOperation
 import yaml
+try:
+    # C-implementerad YAML-parser när PyYAML är byggt mot libyaml
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:
+    from yaml import SafeLoader
 import pdfplumber
+try:
+    # MuPDF-baserad textextraktion, betydligt snabbare än pdfminer
+    import pymupdf
+except ImportError:
+    try:
+        # Äldre versioner av PyMuPDF heter fitz
+        import fitz as pymupdf
+    except ImportError:
+        pymupdf = None
 from .models import Bill
+from . import upcoming_bills
+
+
+# Mönster för att identifiera belopp (SEK, kr, kronor), i prioritetsordning.
+# Matchar: 1 234,56, 1234.56, 1234,56 kr, etc.
+# Kompileras en gång vid modulimport i stället för vid varje anrop.
+_AMOUNT_PATTERNS = [
+    re.compile(pattern, re.IGNORECASE) for pattern in (
+        r'Belopp:?\s*([\d\s]+[,\.]?\d{0,2})',
+        r'Att betala:?\s*([\d\s]+[,\.]?\d{0,2})',
+        r'Totalt:?\s*([\d\s]+[,\.]?\d{0,2})',
+        r'Summa:?\s*([\d\s]+[,\.]?\d{0,2})',
+        r'(?:SEK|kr|kronor)?\s*([\d\s]+[,\.]?\d{0,2})\s*(?:SEK|kr|kronor)?'
+    )
+]
+
+# Mönster för datum (YYYY-MM-DD, DD-MM-YYYY, DD/MM/YYYY, etc.)
+_DATE_PATTERNS = [
+    re.compile(pattern, re.IGNORECASE) for pattern in (
+        r'(\d{4}-\d{2}-\d{2})',
+        r'(\d{2}[-/]\d{2}[-/]\d{4})',
+        r'(\d{2}\.\d{2}\.\d{4})',
+        r'Förfallodatum:?\s*(\d{4}-\d{2}-\d{2})',
+        r'Förfallodatum:?\s*(\d{2}[-/]\d{2}[-/]\d{4})',
+        r'Sista betalningsdag:?\s*(\d{4}-\d{2}-\d{2})',
+        r'Sista betalningsdag:?\s*(\d{2}[-/]\d{2}[-/]\d{4})',
+        r'Betalas senast:?\s*(\d{4}-\d{2}-\d{2})',
+        r'Betalas senast:?\s*(\d{2}[-/]\d{2}[-/]\d{4})'
+    )
+]
+
+# Datumformat för DD?MM?YYYY, efter avgränsarna på position 2 och 5.
+# Datumen från _DATE_PATTERNS har fast bredd, så avgränsarna avgör formatet.
+_DAY_FIRST_FORMATS = {'--': '%d-%m-%Y', '//': '%d/%m/%Y', '..': '%d.%m.%Y'}
+
+# Nyckelord för att gissa fakturans kategori, i prioritetsordning
+# (försäkring går före boenderelaterade kostnader). Första kategorin
+# med ett nyckelord i texten vinner.
+_CATEGORY_KEYWORDS = (
+    ("Försäkring", ('försäkring', 'insurance', 'hemförsäkring', 'bilförsäkring')),
+    ("Boende", (
+        'el', 'elräkning', 'elavgift', 'energi',
+        'vatten', 'va-avgift',
+        'hyra', 'hyreskostnad',
+        'telefon', 'tele2', 'telia', 'telenor', 'mobilabonnemang',
+        'internet', 'bredband', 'wifi',
+    )),
+)
+
+# Samma tabell utan nyckelord som innehåller ett kortare nyckelord i samma
+# kategori (t.ex. 'elräkning' och 'telia' innehåller 'el'). De kan aldrig
+# avgöra utfallet men kostar en genomsökning av texten när inget matchar.
+_CATEGORY_SCAN = tuple(
+    (name, tuple(word for word in keywords
+                 if not any(other != word and other in word for other in keywords)))
+    for name, keywords in _CATEGORY_KEYWORDS
+)
+
+# Under detta antal filer kostar uppstarten av en processpool mer än den sparar
+_MIN_PARALLEL_FILES = 4
+
+# Minsta antal sidor för att en enskild fil ska läsas i en processpool
+_MIN_PARALLEL_PAGES = 5
+
+# Sätts i arbetsprocesserna så att de inte startar egna processpooler
+_IN_PDF_WORKER = False
+
+# Mönster för fakturans namn/typ
+_NAME_PATTERNS = [
+    re.compile(pattern, re.IGNORECASE) for pattern in (
+        r'Faktura(?:\s+för)?:?\s*([^\n]+)',
+        r'Leverantör:?\s*([^\n]+)',
+        r'Från:?\s*([^\n]+)',
+        # Företagsnamn. Lookbehinden ändrar inte träffen (en träff mitt i
+        # ett ord har alltid en tidigare träff från ordets början) men gör
+        # att varje ord bara provas från början, i stället för från varje
+        # bokstav med bakåtspårning som blir kvadratisk i ordlängden
+        r'(?<![a-zåäö])([A-ZÅÄÖ][a-zåäö]+\s+(?:AB|HB|KB))',
+    )
+]
+
+
+def _page_text(page, roi: Optional[Tuple[float, float, float, float]] = None) -> str:
+    """
+    Extraherar texten från en pdfplumber-sida och släpper sidans cache.
+    
+    Args:
+        page: pdfplumber-sida
+        roi: Valfritt område (x0, top, x1, bottom) i PDF-punkter
+        
+    Returns:
+        Sidans text (tom sträng om sidan saknar text)
+    """
+    try:
+        page_text = None
+        if roi is not None:
+            page_text = page.within_bbox(roi, strict=False).extract_text()
+        if not page_text:
+            page_text = page.extract_text()
+        return page_text or ''
+    finally:
+        page.close()
+
+
+def iter_pdf_pages(
+    file_path: str,
+    roi: Optional[Tuple[float, float, float, float]] = None
+) -> Iterator[str]:
+    """
+    Läser text från en PDF-fil sida för sida.
+    
+    Varje sidas cachade layoutobjekt släpps direkt efter textextraktionen,
+    så att bara en sida i taget hålls i minnet. Om ett område (roi) anges
+    för en känd fakturamall tolkas bara tecknen inom området, vilket
+    sparar textflödesberäkningen för resten av sidan. Sidor där området
+    saknar text läses i sin helhet.
+    
+    Args:
+        file_path: Sökväg till PDF-filen
+        roi: Valfritt område (x0, top, x1, bottom) i PDF-punkter
+        
+    Yields:
+        Text för varje sida (tom sträng om sidan saknar text)
+    """
+    with pdfplumber.open(str(file_path)) as pdf:
+        for page in pdf.pages:
+            yield _page_text(page, roi)
+
+
+def _extract_text_with_pymupdf(
+    file_path: str,
+    roi: Optional[Tuple[float, float, float, float]] = None
+) -> str:
+    """
+    Läser text från en PDF-fil med PyMuPDF.
+    
+    Om ett område (roi) anges läses bara texten inom området, med samma
+    koordinater som pdfplumber (origo uppe till vänster). Sidor där området
+    saknar text läses i sin helhet, precis som i iter_pdf_pages().
+    
+    Args:
+        file_path: Sökväg till PDF-filen
+        roi: Valfritt område (x0, top, x1, bottom) i PDF-punkter
+        
+    Returns:
+        Extraherad text, eller tom sträng om PDF:en saknar textlager
+    """
+    pages = []
+    with pymupdf.open(file_path) as doc:
+        for page in doc:
+            page_text = page.get_text(clip=roi) if roi is not None else None
+            if not page_text or not page_text.strip():
+                page_text = page.get_text()
+            if page_text:
+                pages.append(page_text)
+    
+    return '\n'.join(pages)
+
+
+def _extract_page_range(
+    file_path: str,
+    first_page: int,
+    last_page: int,
+    roi: Optional[Tuple[float, float, float, float]] = None
+) -> List[str]:
+    """
+    Läser texten för ett sidintervall (körs i en arbetsprocess).
+    
+    Args:
+        file_path: Sökväg till PDF-filen
+        first_page: Första sidan, 1-indexerad
+        last_page: Sista sidan, 1-indexerad och inklusive
+        roi: Valfritt område (x0, top, x1, bottom), se iter_pdf_pages()
+        
+    Returns:
+        Text för varje sida i intervallet
+    """
+    with pdfplumber.open(file_path, pages=list(range(first_page, last_page + 1))) as pdf:
+        return [_page_text(page, roi) for page in pdf.pages]
+
+
+def _page_ranges(page_count: int, parts: int) -> List[Tuple[int, int]]:
+    """
+    Delar upp sidorna 1..page_count i sammanhängande intervall.
+    
+    Args:
+        page_count: Antal sidor
+        parts: Önskat antal intervall
+        
+    Returns:
+        Lista med (första sida, sista sida), 1-indexerat och inklusive
+    """
+    size = -(-page_count // parts)
+    return [(start, min(start + size - 1, page_count)) for start in range(1, page_count + 1, size)]
+
+
+def _map_page_ranges(worker, file_path: str, page_count: int, max_workers: Optional[int], *args) -> List[str]:
+    """
+    Kör worker över sidintervall i en processpool och sätter ihop resultatet.
+    
+    Args:
+        worker: Funktion (file_path, first_page, last_page, *args) -> lista med sidtexter
+        file_path: Sökväg till PDF-filen
+        page_count: Antal sidor i filen
+        max_workers: Max antal processer (standard: antal CPU-kärnor)
+        *args: Extra argument till worker
+        
+    Returns:
+        Text för varje sida, i sidordning
+    """
+    workers = min(max_workers or os.cpu_count() or 1, page_count)
+    ranges = _page_ranges(page_count, workers)
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_pdf_worker) as executor:
+        futures = [executor.submit(worker, file_path, first, last, *args) for first, last in ranges]
+        return [page_text for future in futures for page_text in future.result()]
 
 
-def extract_text_from_pdf(file_path: str) -> str:
+def _use_page_pool(page_count: int) -> bool:
+    """
+    Avgör om sidorna i en fil ska fördelas över en processpool.
+    
+    Args:
+        page_count: Antal sidor i filen
+        
+    Returns:
+        True om filen har fler än fyra sidor och vi inte redan kör i en
+        arbetsprocess (t.ex. från extract_bills_from_dir)
+    """
+    return page_count >= _MIN_PARALLEL_PAGES and not _IN_PDF_WORKER
+
+
+def extract_text_from_pdf(
+    file_path: str,
+    roi: Optional[Tuple[float, float, float, float]] = None,
+    max_workers: Optional[int] = None
+) -> str:
     """
     Läser text från PDF-sidor och returnerar som sträng.
     
-    Använder pdfplumber för att extrahera all text från en PDF-fil.
+    Använder PyMuPDF om det är installerat, annars pdfplumber, för att
+    extrahera all text från en PDF-fil. Om PyMuPDF inte hittar någon text
+    används pdfplumber. Med pdfplumber fördelas dokument med fler än fyra
+    sidor i sidintervall över en ProcessPoolExecutor, där varje process
+    öppnar filen med bara sina sidor.
     
     Args:
         file_path: Sökväg till PDF-filen
+        roi: Valfritt område (x0, top, x1, bottom) att läsa, se iter_pdf_pages()
+        max_workers: Max antal processer (standard: antal CPU-kärnor)
         
     Returns:
         Extraherad text som en sammanhängande sträng
@@ -57,19 +315,134 @@ def extract_text_from_pdf(file_path: str) -> str:
         raise FileNotFoundError(f"PDF-fil hittades inte: {file_path}")
     
     try:
-        text_parts = []
+        if pymupdf is not None:
+            text = _extract_text_with_pymupdf(str(pdf_file), roi)
+            if text.strip():
+                return text
+        
         with pdfplumber.open(str(pdf_file)) as pdf:
-            for page in pdf.pages:
-                page_text = page.extract_text()
-                if page_text:
-                    text_parts.append(page_text)
+            page_count = len(pdf.pages)
+        
+        if _use_page_pool(page_count):
+            pages = _map_page_ranges(_extract_page_range, str(pdf_file), page_count, max_workers, roi)
+        else:
+            pages = iter_pdf_pages(pdf_file, roi)
         
-        return '\n'.join(text_parts)
+        return '\n'.join(page_text for page_text in pages if page_text)
     except Exception as e:
         raise Exception(f"Kunde inte läsa PDF-fil: {e}")
 
 
-def extract_bills_from_text(raw_text: str, default_category: str = "Boende") -> List[Bill]:
+def _parse_date(date_str: str) -> Optional[date]:
+    """
+    Tolkar en datumsträng som matchats av _DATE_PATTERNS.
+    
+    Formatet läses av direkt från avgränsarna, så strptime anropas högst
+    en gång i stället för att varje format provas i tur och ordning.
+    
+    Args:
+        date_str: Datum som YYYY-MM-DD, DD-MM-YYYY, DD/MM/YYYY eller DD.MM.YYYY
+        
+    Returns:
+        Datum, eller None om strängen inte är ett giltigt datum
+    """
+    if date_str[4] == '-':
+        fmt = '%Y-%m-%d'
+    else:
+        # Blandade avgränsare (t.ex. 15-12/2025) är inget giltigt datum
+        fmt = _DAY_FIRST_FORMATS.get(date_str[2] + date_str[5])
+        if fmt is None:
+            return None
+    
+    try:
+        return datetime.strptime(date_str, fmt).date()
+    except ValueError:
+        return None
+
+
+def _parse_amount(amount_str: str) -> Optional[Decimal]:
+    """
+    Tolkar en beloppsträff som Decimal.
+    
+    Mellanslag som tusentalsavgränsare tas bort och decimalkomma blir
+    punkt. Träffar som inte är ett tal (t.ex. bara blanktecken eller
+    radbrytningar mitt i) ger None.
+    
+    Args:
+        amount_str: Matchad beloppssträng, t.ex. "1 234,56"
+        
+    Returns:
+        Beloppet, eller None om strängen inte kan tolkas
+    """
+    try:
+        return Decimal(amount_str.strip().replace(' ', '').replace(',', '.'))
+    except InvalidOperation:
+        return None
+
+
+def _is_positive_amount(amount_str: str) -> bool:
+    """
+    Kontrollerar om en beloppsträff kan tolkas som ett positivt belopp.
+    
+    Args:
+        amount_str: Matchad beloppssträng, t.ex. "1 234,56"
+        
+    Returns:
+        True om beloppet är större än noll
+    """
+    amount = _parse_amount(amount_str)
+    return amount is not None and amount > 0
+
+
+def _first_hit_settled(patterns: List['re.Pattern'], text: str, accept) -> bool:
+    """
+    Avgör om mönstrens utfall i texten inte kan ändras av mer text.
+    
+    Mönstren provas i prioritetsordning precis som i extract_bills_from_text().
+    Utfallet är avgjort när första mönstret vars träff godtas hittats, och
+    varje mönster fram till dess har en träff som slutar före textens slut
+    (en träff vid slutet kan förlängas av nästa sida, och ett mönster utan
+    träff kan få en).
+    
+    Args:
+        patterns: Kompilerade mönster med en fångstgrupp, i prioritetsordning
+        text: Text som lästs hittills
+        accept: Funktion som avgör om en träff ger ett giltigt värde
+        
+    Returns:
+        True om utfallet är avgjort
+    """
+    for pattern in patterns:
+        match = pattern.search(text)
+        if match is None or match.end() >= len(text):
+            return False
+        if accept(match.group(1)):
+            return True
+    return False
+
+
+def _fields_settled(text: str) -> bool:
+    """
+    Avgör om belopp, förfallodatum och namn är slutgiltigt bestämda.
+    
+    Args:
+        text: Text som lästs hittills
+        
+    Returns:
+        True om ingen ytterligare text kan ändra de tre fälten
+    """
+    return (
+        _first_hit_settled(_AMOUNT_PATTERNS, text, _is_positive_amount)
+        and _first_hit_settled(_DATE_PATTERNS, text, lambda date_str: _parse_date(date_str) is not None)
+        and _first_hit_settled(_NAME_PATTERNS, text, lambda name: len(name.strip()) > 2)
+    )
+
+
+def extract_bills_from_text(
+    raw_text: Union[str, Iterable[str]],
+    default_category: str = "Boende",
+    stop_early: bool = False
+) -> List[Bill]:
     """
     Identifierar fakturor i texten via regex eller heuristik.
     
@@ -77,78 +450,56 @@ def extract_bills_from_text(raw_text: str, default_category: str = "Boende") ->
     fakturainformation (belopp, datum, betalningsmottagare).
     
     Args:
-        raw_text: Rå text från PDF
+        raw_text: Rå text från PDF, eller sidtexter från iter_pdf_pages().
+            Sidorna tolkas tillsammans eftersom belopp och förfallodatum
+            kan stå på olika sidor.
         default_category: Standardkategori om ingen kan identifieras
+        stop_early: Om True och raw_text är sidtexter, sluta läsa sidor när
+            belopp, förfallodatum och namn inte längre kan ändras. Fälten blir
+            desamma som för hela texten, men kategorin gissas bara utifrån
+            de sidor som lästs.
         
     Returns:
         Lista med Bill-objekt
     """
-    bills = []
-    
-    # Mönster för att identifiera belopp (SEK, kr, kronor)
-    # Matchar: 1 234,56, 1234.56, 1234,56 kr, etc.
-    amount_patterns = [
-        r'Belopp:?\s*([\d\s]+[,\.]?\d{0,2})',
-        r'Att betala:?\s*([\d\s]+[,\.]?\d{0,2})',
-        r'Totalt:?\s*([\d\s]+[,\.]?\d{0,2})',
-        r'Summa:?\s*([\d\s]+[,\.]?\d{0,2})',
-        r'(?:SEK|kr|kronor)?\s*([\d\s]+[,\.]?\d{0,2})\s*(?:SEK|kr|kronor)?'
-    ]
-    
-    # Mönster för datum (YYYY-MM-DD, DD-MM-YYYY, DD/MM/YYYY, etc.)
-    date_patterns = [
-        r'(\d{4}-\d{2}-\d{2})',
-        r'(\d{2}[-/]\d{2}[-/]\d{4})',
-        r'(\d{2}\.\d{2}\.\d{4})',
-        r'Förfallodatum:?\s*(\d{4}-\d{2}-\d{2})',
-        r'Förfallodatum:?\s*(\d{2}[-/]\d{2}[-/]\d{4})',
-        r'Sista betalningsdag:?\s*(\d{4}-\d{2}-\d{2})',
-        r'Sista betalningsdag:?\s*(\d{2}[-/]\d{2}[-/]\d{4})',
-        r'Betalas senast:?\s*(\d{4}-\d{2}-\d{2})',
-        r'Betalas senast:?\s*(\d{2}[-/]\d{2}[-/]\d{4})'
-    ]
+    if not isinstance(raw_text, str):
+        if stop_early:
+            pages = []
+            for page_text in raw_text:
+                if page_text:
+                    pages.append(page_text)
+                    if _fields_settled('\n'.join(pages)):
+                        break
+            raw_text = '\n'.join(pages)
+        else:
+            raw_text = '\n'.join(page_text for page_text in raw_text if page_text)
     
-    # Mönster för fakturans namn/typ
-    name_patterns = [
-        r'Faktura(?:\s+för)?:?\s*([^\n]+)',
-        r'Leverantör:?\s*([^\n]+)',
-        r'Från:?\s*([^\n]+)',
-        r'([A-ZÅÄÖ][a-zåäö]+\s+(?:AB|HB|KB))',  # Företagsnamn
-    ]
+    bills = []
     
     # Försök extrahera belopp
     amount = None
-    for pattern in amount_patterns:
-        match = re.search(pattern, raw_text, re.IGNORECASE)
+    for pattern in _AMOUNT_PATTERNS:
+        match = pattern.search(raw_text)
         if match:
-            amount_str = match.group(1).strip().replace(' ', '').replace(',', '.')
-            try:
-                amount = Decimal(amount_str)
+            parsed = _parse_amount(match.group(1))
+            if parsed is not None:
+                amount = parsed
                 if amount > 0:
                     break
-            except:
-                continue
     
     # Försök extrahera datum
     due_date = None
-    for pattern in date_patterns:
-        match = re.search(pattern, raw_text, re.IGNORECASE)
+    for pattern in _DATE_PATTERNS:
+        match = pattern.search(raw_text)
         if match:
-            date_str = match.group(1)
-            # Försök olika datumformat
-            for fmt in ['%Y-%m-%d', '%d-%m-%Y', '%d/%m/%Y', '%d.%m.%Y']:
-                try:
-                    due_date = datetime.strptime(date_str, fmt).date()
-                    break
-                except ValueError:
-                    continue
+            due_date = _parse_date(match.group(1))
             if due_date:
                 break
     
     # Försök extrahera namn
     bill_name = None
-    for pattern in name_patterns:
-        match = re.search(pattern, raw_text, re.IGNORECASE)
+    for pattern in _NAME_PATTERNS:
+        match = pattern.search(raw_text)
         if match:
             bill_name = match.group(1).strip()
             if bill_name and len(bill_name) > 2:
@@ -160,23 +511,12 @@ def extract_bills_from_text(raw_text: str, default_category: str = "Boende") ->
             bill_name = "Faktura från PDF"
         
         # Gissa kategori baserat på nyckelord (prioritetsordning)
-        category = default_category
         text_lower = raw_text.lower()
-        
-        # Försäkring har högst prioritet
-        if any(word in text_lower for word in ['försäkring', 'insurance', 'hemförsäkring', 'bilförsäkring']):
-            category = "Försäkring"
-        # Sedan boenderelaterade kostnader
-        elif any(word in text_lower for word in ['el', 'elräkning', 'elavgift', 'energi']):
-            category = "Boende"
-        elif any(word in text_lower for word in ['vatten', 'va-avgift']):
-            category = "Boende"
-        elif any(word in text_lower for word in ['hyra', 'hyreskostnad']):
-            category = "Boende"
-        elif any(word in text_lower for word in ['telefon', 'tele2', 'telia', 'telenor', 'mobilabonnemang']):
-            category = "Boende"
-        elif any(word in text_lower for word in ['internet', 'bredband', 'wifi']):
-            category = "Boende"
+        category = next(
+            (name for name, keywords in _CATEGORY_SCAN
+             if any(word in text_lower for word in keywords)),
+            default_category
+        )
         
         try:
             bill = Bill(
@@ -235,42 +575,73 @@ def validate_bill_structure(bill: Bill) -> bool:
         return False
 
 
-def write_bills_to_yaml(bills: List[Bill], yaml_path: str) -> None:
+class BillWriter:
     """
-    Lägger till extraherade fakturor i upcoming_bills.yaml.
+    Lägger till fakturor från flera PDF:er i upcoming_bills.yaml i en omgång.
     
-    Läser befintlig YAML-fil, lägger till nya fakturor och sparar.
-    Undviker dubbletter genom att jämföra namn och förfallodatum.
+    YAML-filen läses när blocket öppnas och skrivs en gång när det
+    stängs utan fel, i stället för en läsning och skrivning per PDF.
+    Dubbletter (samma namn, förfallodatum och belopp) hoppas över, även
+    mellan fakturor som lagts till i samma omgång.
     
-    Args:
-        bills: Lista med validerade Bill-objekt
-        yaml_path: Sökväg till upcoming_bills.yaml
-        
-    Raises:
-        Exception: Om YAML-filen inte kan läsas eller skrivas
+    Exempel:
+        with BillWriter(yaml_path) as writer:
+            for path in pdf_paths:
+                writer.add(parse_pdf_to_bills(path))
+    
+    Attributes:
+        added_count: Antal nya fakturor som lagts till hittills
     """
-    yaml_file = Path(yaml_path)
     
-    try:
+    def __init__(self, yaml_path: Union[str, Path]):
+        """
+        Args:
+            yaml_path: Sökväg till upcoming_bills.yaml
+        """
+        self.yaml_file = Path(yaml_path)
+        self.added_count = 0
+        self._data = None
+        self._existing_amounts = {}
+    
+    def __enter__(self) -> 'BillWriter':
         # Ladda befintliga fakturor
-        if yaml_file.exists():
-            with open(yaml_file, 'r', encoding='utf-8') as f:
-                data = yaml.safe_load(f) or {}
+        if self.yaml_file.exists():
+            with open(self.yaml_file, 'r', encoding='utf-8') as f:
+                data = yaml.load(f, Loader=SafeLoader) or {}
         else:
             data = {}
-        
+    
         if 'upcoming_bills' not in data:
             data['upcoming_bills'] = {'bills': []}
         elif 'bills' not in data['upcoming_bills']:
             data['upcoming_bills']['bills'] = []
-        
-        # Lägg till nya fakturor
-        added_count = 0
+    
+        # Index över befintliga fakturor: (namn, förfallodatum) -> belopp,
+        # så att varje ny faktura jämförs bara mot fakturor med samma nyckel
+        self._existing_amounts = {}
+        for b in data['upcoming_bills']['bills']:
+            key = (b.get('name'), b.get('due_date'))
+            self._existing_amounts.setdefault(key, []).append(b.get('amount', 0))
+    
+        self._data = data
+        return self
+    
+    def add(self, bills: List[Bill]) -> int:
+        """
+        Lägger till fakturor som inte redan finns.
+    
+        Args:
+            bills: Lista med Bill-objekt, t.ex. från en PDF
+    
+        Returns:
+            Antal fakturor som faktiskt lades till
+        """
+        added = 0
         for bill in bills:
             if not validate_bill_structure(bill):
                 print(f"Faktura {bill.name} validerades inte korrekt, hoppar över")
                 continue
-            
+    
             # Konvertera Bill till dictionary
             bill_dict = {
                 'name': bill.name,
@@ -282,39 +653,64 @@ def write_bills_to_yaml(bills: List[Bill], yaml_path: str) -> None:
                 'frequency': bill.frequency,
                 'paid': bill.paid
             }
-            
+    
             if bill.payment_date:
                 bill_dict['payment_date'] = bill.payment_date.isoformat()
-            
-            # Kontrollera för dubbletter
-            duplicate = any(
-                b.get('name') == bill_dict['name'] and
-                abs(float(b.get('amount', 0)) - bill_dict['amount']) < 0.01 and
-                b.get('due_date') == bill_dict['due_date']
-                for b in data['upcoming_bills']['bills']
-            )
-            
+    
+            # Kontrollera för dubbletter (samma namn, förfallodatum och belopp)
+            amounts = self._existing_amounts.setdefault((bill_dict['name'], bill_dict['due_date']), [])
+            duplicate = any(abs(float(amount) - bill_dict['amount']) < 0.01 for amount in amounts)
+    
             if not duplicate:
-                data['upcoming_bills']['bills'].append(bill_dict)
-                added_count += 1
-        
-        # Spara tillbaka
-        yaml_file.parent.mkdir(parents=True, exist_ok=True)
-        with open(yaml_file, 'w', encoding='utf-8') as f:
-            yaml.dump(data, f, allow_unicode=True, default_flow_style=False)
-        
-        print(f"✅ Lade till {added_count} nya fakturor i {yaml_path}")
-        
+                self._data['upcoming_bills']['bills'].append(bill_dict)
+                amounts.append(bill_dict['amount'])
+                added += 1
+    
+        self.added_count += added
+        return added
+    
+    def __exit__(self, exc_type, exc_value, traceback) -> bool:
+        # Skriv bara tillbaka om blocket avslutades utan fel
+        if exc_type is None:
+            self.yaml_file.parent.mkdir(parents=True, exist_ok=True)
+            # Atomär skrivning som också tömmer upcoming_bills läscache
+            upcoming_bills.save_bills_data(self.yaml_file, self._data)
+        return False
+
+
+def write_bills_to_yaml(bills: List[Bill], yaml_path: str) -> None:
+    """
+    Lägger till extraherade fakturor i upcoming_bills.yaml.
+    
+    Läser befintlig YAML-fil, lägger till nya fakturor och sparar.
+    Undviker dubbletter genom att jämföra namn och förfallodatum.
+    Använd BillWriter för att skriva fakturor från flera PDF:er med en
+    enda läsning och skrivning av filen.
+    
+    Args:
+        bills: Lista med validerade Bill-objekt
+        yaml_path: Sökväg till upcoming_bills.yaml
+    
+    Raises:
+        Exception: Om YAML-filen inte kan läsas eller skrivas
+    """
+    try:
+        with BillWriter(yaml_path) as writer:
+            writer.add(bills)
+    
+        print(f"✅ Lade till {writer.added_count} nya fakturor i {yaml_path}")
+    
     except Exception as e:
         raise Exception(f"Kunde inte skriva fakturor till YAML: {e}")
 
 
-def extract_text_with_ocr(file_path: str) -> str:
+def extract_text_with_ocr(file_path: str, max_workers: Optional[int] = None) -> str:
     """
     Använder OCR för att tolka bildbaserade fakturor (valfri funktion).
     
     Konverterar PDF till bilder och använder Tesseract OCR för att
-    extrahera text från bildbaserade fakturor.
+    extrahera text från bildbaserade fakturor. Dokument med fler än fyra
+    sidor fördelas i sidintervall över en ProcessPoolExecutor.
     
     Kräver:
     - pytesseract
@@ -322,6 +718,7 @@ def extract_text_with_ocr(file_path: str) -> str:
     
     Args:
         file_path: Sökväg till PDF-filen
+        max_workers: Max antal processer (standard: antal CPU-kärnor)
         
     Returns:
         OCR-tolkad text som sträng
@@ -332,7 +729,7 @@ def extract_text_with_ocr(file_path: str) -> str:
     """
     try:
         import pytesseract
-        from pdf2image import convert_from_path
+        from pdf2image import pdfinfo_from_path
     except ImportError:
         raise ImportError(
             "OCR-funktionalitet kräver pytesseract och pdf2image. "
@@ -345,30 +742,97 @@ def extract_text_with_ocr(file_path: str) -> str:
         raise FileNotFoundError(f"PDF-fil hittades inte: {file_path}")
     
     try:
-        # Konvertera PDF till bilder
-        images = convert_from_path(str(pdf_file))
-        
-        # Använd OCR på varje sida
-        text_parts = []
-        for i, image in enumerate(images):
-            try:
-                text = pytesseract.image_to_string(image, lang='swe')
-                if text:
-                    text_parts.append(text)
-            except Exception as e:
-                print(f"Kunde inte läsa sida {i + 1} med OCR: {e}")
-                continue
+        page_count = pdfinfo_from_path(str(pdf_file))['Pages']
+        
+        # Rendering och OCR görs per sidintervall i arbetsprocesserna, så
+        # att bilderna aldrig behöver skickas mellan processer
+        if _use_page_pool(page_count):
+            text_parts = _map_page_ranges(_ocr_page_range, str(pdf_file), page_count, max_workers)
+        else:
+            text_parts = _ocr_page_range(str(pdf_file), 1, page_count)
         
-        return '\n'.join(text_parts)
+        return '\n'.join(text for text in text_parts if text)
         
     except Exception as e:
         raise Exception(f"OCR misslyckades: {e}")
 
 
+def _ocr_page_range(file_path: str, first_page: int, last_page: int) -> List[str]:
+    """
+    Renderar och OCR-tolkar ett sidintervall.
+    
+    Args:
+        file_path: Sökväg till PDF-filen
+        first_page: Första sidan, 1-indexerad
+        last_page: Sista sidan, 1-indexerad och inklusive
+        
+    Returns:
+        OCR-text för varje sida i intervallet (tom sträng om sidan misslyckas)
+    """
+    import pytesseract
+    from pdf2image import convert_from_path
+    
+    # Konvertera PDF till bilder
+    images = convert_from_path(file_path, first_page=first_page, last_page=last_page)
+    
+    # Flera sidor tolkas i ett enda tesseract-anrop så att processtart och
+    # modelladdning bara sker en gång per intervall
+    if len(images) > 1:
+        try:
+            return _ocr_multipage(images)
+        except Exception as e:
+            print(f"Batch-OCR misslyckades, tolkar sida för sida: {e}")
+    
+    # Använd OCR på varje sida
+    text_parts = []
+    for i, image in enumerate(images, start=first_page):
+        try:
+            text_parts.append(pytesseract.image_to_string(image, lang='swe') or '')
+        except Exception as e:
+            print(f"Kunde inte läsa sida {i} med OCR: {e}")
+            text_parts.append('')
+    
+    return text_parts
+
+
+def _ocr_multipage(images: List) -> List[str]:
+    """
+    OCR-tolkar flera sidbilder med ett enda tesseract-anrop.
+    
+    Bilderna sparas som en flersidig TIFF i en temporär katalog, och
+    tesseracts utdata delas upp per sida på sidbrytningstecknet.
+    
+    Args:
+        images: PIL-bilder i sidordning
+        
+    Returns:
+        OCR-text för varje sida
+        
+    Raises:
+        ValueError: Om antalet sidor i utdata inte stämmer med antalet bilder
+    """
+    import pytesseract
+    
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        tiff_path = os.path.join(tmp_dir, 'pages.tiff')
+        images[0].save(
+            tiff_path, save_all=True, append_images=images[1:], compression='tiff_lzw'
+        )
+        text = pytesseract.image_to_string(tiff_path, lang='swe') or ''
+    
+    # Tesseract avslutar varje sida med formfeed
+    pages = text.split('\f')
+    if len(pages) < len(images) or any(page.strip() for page in pages[len(images):]):
+        raise ValueError(f"förväntade {len(images)} sidor, fick {len(pages)}")
+    return pages[:len(images)]
+
+
 def parse_pdf_to_bills(
     file_path: str, 
     default_category: str = "Boende", 
-    ocr_enabled: bool = False
+    ocr_enabled: bool = False,
+    roi: Optional[Tuple[float, float, float, float]] = None,
+    stop_early: bool = False
 ) -> List[Bill]:
     """
     Huvudfunktion för att parsa PDF och extrahera fakturor.
@@ -380,13 +844,23 @@ def parse_pdf_to_bills(
         file_path: Sökväg till PDF-filen
         default_category: Standardkategori för fakturor
         ocr_enabled: Om OCR ska användas för bildbaserade PDFs
+        roi: Valfritt område (x0, top, x1, bottom) där fakturauppgifterna
+            står för en känd fakturamall
+        stop_early: Om True läses sidorna en i taget och läsningen avbryts
+            när fakturans fält är bestämda, se extract_bills_from_text()
         
     Returns:
         Lista med extraherade Bill-objekt
     """
     # Försök med textextraktion först
     try:
-        text = extract_text_from_pdf(file_path)
+        if stop_early:
+            bills = extract_bills_from_text(iter_pdf_pages(file_path, roi), default_category, stop_early=True)
+            # Utan träff har alla sidor lästs; fortsätt bara om OCR kan hjälpa
+            if bills or not ocr_enabled:
+                return bills
+        
+        text = extract_text_from_pdf(file_path, roi)
         
         # Om ingen text extraherades och OCR är aktiverat, försök med OCR
         if (not text or len(text.strip()) < 10) and ocr_enabled:
@@ -401,3 +875,55 @@ def parse_pdf_to_bills(
     except Exception as e:
         print(f"Fel vid parsning av PDF: {e}")
         return []
+
+
+def _init_pdf_worker() -> None:
+    """
+    Initierar en arbetsprocess för PDF-parsning.
+    
+    Tesseract startar annars en OpenMP-tråd per kärna i varje process,
+    vilket ger överbokning när flera processer kör OCR samtidigt. Processen
+    markeras också som arbetsprocess så att den inte startar en egen pool.
+    """
+    global _IN_PDF_WORKER
+    _IN_PDF_WORKER = True
+    os.environ['OMP_NUM_THREADS'] = '1'
+
+
+def extract_bills_from_dir(
+    paths: Union[str, Path, Iterable[Union[str, Path]]],
+    default_category: str = "Boende",
+    ocr_enabled: bool = False,
+    max_workers: Optional[int] = None
+) -> List[List[Bill]]:
+    """
+    Parsar flera PDF-fakturor, fördelat över flera processer.
+    
+    Varje fil parsas med parse_pdf_to_bills i en ProcessPoolExecutor.
+    Vid färre än fyra filer parsas de istället en i taget i
+    huvudprocessen, eftersom processuppstarten då dominerar.
+    
+    Args:
+        paths: En katalog (alla *.pdf i den läses), en enskild fil eller en
+            lista med sökvägar
+        default_category: Standardkategori för fakturor
+        ocr_enabled: Om OCR ska användas för bildbaserade PDFs
+        max_workers: Max antal processer (standard: antal CPU-kärnor)
+        
+    Returns:
+        Lista med en fakturalista per fil, i samma ordning som paths
+    """
+    if isinstance(paths, (str, Path)):
+        # En enskild sökväg är antingen en katalog eller en fil; en sträng
+        # får inte itereras tecken för tecken
+        paths = sorted(Path(paths).glob('*.pdf')) if Path(paths).is_dir() else [paths]
+    paths = [str(path) for path in paths]
+    
+    parse = partial(parse_pdf_to_bills, default_category=default_category, ocr_enabled=ocr_enabled)
+    
+    if len(paths) < _MIN_PARALLEL_FILES:
+        return [parse(path) for path in paths]
+    
+    with ProcessPoolExecutor(max_workers=max_workers or os.cpu_count(),
+                             initializer=_init_pdf_worker) as executor:
+        return list(executor.map(parse, paths))
@@ -6,14 +6,37 @@ strukturerat format. Den hanterar datumkonvertering, textbearbetning och
 extrahering av metadata som butik, kategori och plats.
 """
 
+import importlib.util
+import re
+import numpy as np
 import pandas as pd
-from typing import List
+from typing import List, Optional
+from .file_cache import cached_file_loader
 from .models import Transaction
 from pathlib import Path
 import yaml
 
 
-def parse_dates(data: pd.DataFrame) -> pd.DataFrame:
+# Valfri snabbare CSV-motor, och kolumnvis Parquet-lagring när den finns
+_HAS_PYARROW = importlib.util.find_spec("pyarrow") is not None
+
+# Filnamn för sparade transaktioner i datakatalogen
+TRANSACTIONS_PARQUET = "transactions.parquet"
+TRANSACTIONS_CSV = "transactions.csv"
+
+
+# Rensningsmönster för beskrivningar: bankkoder (t.ex. *XXXX XXXX) och
+# referensnummer (t.ex. REF:12345) tas bort, blanktecken slås ihop.
+# Kompileras en gång vid modulimport.
+_DESCRIPTION_CLEAN_RE = re.compile(r'\*\d{4}\s+\d{4}|REF:\d+|\s+')
+
+
+def _clean_match(match: 're.Match') -> str:
+    """Ersättning för _DESCRIPTION_CLEAN_RE: ett mellanslag för blanktecken, annars inget."""
+    return ' ' if match.group(0).isspace() else ''
+
+
+def parse_dates(data: pd.DataFrame, *, copy: bool = True) -> pd.DataFrame:
     """
     Konverterar datum till ISO-format.
     
@@ -22,11 +45,12 @@ def parse_dates(data: pd.DataFrame) -> pd.DataFrame:
     
     Args:
         data: DataFrame med transaktionsdata
+        copy: Om False ändras data direkt i stället för en kopia
         
     Returns:
         DataFrame med standardiserade datum
     """
-    df = data.copy()
+    df = data.copy() if copy else data
     
     if 'date' in df.columns:
         df['date'] = pd.to_datetime(df['date'], errors='coerce')
@@ -34,7 +58,7 @@ def parse_dates(data: pd.DataFrame) -> pd.DataFrame:
     return df
 
 
-def clean_descriptions(data: pd.DataFrame) -> pd.DataFrame:
+def clean_descriptions(data: pd.DataFrame, *, copy: bool = True) -> pd.DataFrame:
     """
     Tar bort onödig text, symboler, bankkoder.
     
@@ -43,34 +67,26 @@ def clean_descriptions(data: pd.DataFrame) -> pd.DataFrame:
     
     Args:
         data: DataFrame med transaktionsdata
+        copy: Om False ändras data direkt i stället för en kopia
         
     Returns:
         DataFrame med rensade beskrivningar
     """
-    import re
-    
-    df = data.copy()
+    df = data.copy() if copy else data
     
     if 'description' in df.columns:
-        # Trimma extra mellanslag
-        df['description'] = df['description'].str.strip()
-        
-        # Ta bort multipla mellanslag
-        df['description'] = df['description'].str.replace(r'\s+', ' ', regex=True)
-        
-        # Ta bort vanliga bankkoder (t.ex. *XXXX XXXX)
-        df['description'] = df['description'].str.replace(r'\*\d{4}\s+\d{4}', '', regex=True)
-        
-        # Ta bort referensnummer (mönster som REF:12345)
-        df['description'] = df['description'].str.replace(r'REF:\d+', '', regex=True)
-        
-        # Trimma igen efter rensning
-        df['description'] = df['description'].str.strip()
+        # Ta bort bankkoder och referensnummer och slå ihop mellanslag i en
+        # genomläsning, trimma sedan
+        df['description'] = (
+            df['description']
+            .str.replace(_DESCRIPTION_CLEAN_RE, _clean_match, regex=True)
+            .str.strip()
+        )
     
     return df
 
 
-def extract_metadata(data: pd.DataFrame) -> pd.DataFrame:
+def extract_metadata(data: pd.DataFrame, *, copy: bool = True) -> pd.DataFrame:
     """
     Identifierar butik, kategori, plats via regex/heuristik.
     
@@ -79,50 +95,68 @@ def extract_metadata(data: pd.DataFrame) -> pd.DataFrame:
     
     Args:
         data: DataFrame med transaktionsdata
+        copy: Om False ändras data direkt i stället för en kopia
         
     Returns:
         DataFrame med extraherad metadata i nya kolumner
     """
-    import re
-    
-    df = data.copy()
+    df = data.copy() if copy else data
     
     # Initiera metadata-kolumner
     df['store'] = None
     df['location'] = None
     
-    if 'description' in df.columns:
-        for idx, row in df.iterrows():
-            desc = str(row['description'])
-            
-            # Extrahera butiksnamn (vanligtvis början av beskrivningen)
-            # Format: "ICA Maxi Linköping" eller "Circle K Bensin"
-            parts = desc.split()
-            if len(parts) >= 2:
-                # Ta första 2-3 ord som butiksnamn
-                store_name = ' '.join(parts[:2])
-                df.at[idx, 'store'] = store_name
-                
-                # Resten kan vara plats
-                if len(parts) > 2:
-                    location = ' '.join(parts[2:])
-                    df.at[idx, 'location'] = location
-            elif len(parts) == 1:
-                df.at[idx, 'store'] = parts[0]
+    if 'description' in df.columns and len(df):
+        # Dela upp alla beskrivningar i ord på en gång
+        parts = df['description'].map(str).str.split()
+        word_count = parts.str.len()
+        
+        # Butiksnamn är vanligtvis de två första orden, resten kan vara plats
+        # Format: "ICA Maxi Linköping" eller "Circle K Bensin"
+        df['store'] = parts.str[:2].str.join(' ').where(word_count > 0, None)
+        df['location'] = parts.str[2:].str.join(' ').where(word_count > 2, None)
     
     return df
 
 
+def parse_transactions_pipeline(data: pd.DataFrame, copy: bool = True) -> pd.DataFrame:
+    """
+    Kör parse_dates, clean_descriptions och extract_metadata i följd.
+    
+    Stegen körs med copy=False på en och samma DataFrame, så att data
+    kopieras högst en gång i stället för en gång per steg.
+    
+    Args:
+        data: DataFrame med transaktionsdata
+        copy: Om False bearbetas data direkt, t.ex. när anroparen äger den
+        
+    Returns:
+        DataFrame med standardiserade datum, rensade beskrivningar och metadata
+    """
+    df = data.copy() if copy else data
+    df = parse_dates(df, copy=False)
+    df = clean_descriptions(df, copy=False)
+    return extract_metadata(df, copy=False)
+
+
 def save_transactions(transactions: List[Transaction], append: bool = True) -> None:
     """
-    Sparar transaktioner till CSV-fil.
+    Sparar transaktioner till fil.
     
-    Lagrar importerade transaktioner i en CSV-fil för senare användning
-    i prognoser och analyser.
+    Lagrar importerade transaktioner för senare användning i prognoser och
+    analyser. Med pyarrow installerat sparas de kolumnvis som Parquet
+    (zstd-komprimerat, kategori och valuta ordbokskodade), annars som CSV.
+    En befintlig CSV-fil läses in och förs över till Parquet vid första
+    sparningen med pyarrow. Filen i det andra formatet tas bort efter
+    skrivningen, så att det aldrig finns en inaktuell kopia kvar.
     
     Args:
         transactions: Lista med Transaction-objekt att spara
         append: Om True, lägg till i befintlig fil. Om False, skriv över.
+    
+    Raises:
+        RuntimeError: Om append är True och transaktionerna ligger i
+            Parquet-format men pyarrow saknas
     """
     if not transactions:
         return
@@ -130,37 +164,99 @@ def save_transactions(transactions: List[Transaction], append: bool = True) -> N
     # Bestäm sökväg till transaktionsfil
     data_dir = Path(__file__).parent.parent / "data"
     data_dir.mkdir(exist_ok=True)
-    transactions_file = data_dir / "transactions.csv"
-    
-    # Konvertera transaktioner till DataFrame
-    data = []
-    for trans in transactions:
-        data.append({
-            'date': str(trans.date),
-            'amount': float(trans.amount),
-            'description': trans.description,
-            'category': trans.category,
-            'currency': trans.currency
-        })
     
-    new_df = pd.DataFrame(data)
+    # Konvertera transaktioner till DataFrame, en kolumn i taget
+    new_df = pd.DataFrame({
+        'date': [str(trans.date) for trans in transactions],
+        'amount': [float(trans.amount) for trans in transactions],
+        'description': [trans.description for trans in transactions],
+        'category': [trans.category for trans in transactions],
+        'currency': [trans.currency for trans in transactions]
+    })
     
     # Lägg till eller skriv över
-    if append and transactions_file.exists():
+    existing_file = _stored_transactions_file(data_dir) if append else None
+    if existing_file is not None:
         # Läs befintliga transaktioner
-        existing_df = pd.read_csv(transactions_file)
+        existing_df = _read_stored_transactions(existing_file)
         # Kombinera och ta bort dubbletter
         combined_df = pd.concat([existing_df, new_df], ignore_index=True)
         # Ta bort dubbletter baserat på datum, belopp och beskrivning
         combined_df = combined_df.drop_duplicates(subset=['date', 'amount', 'description'], keep='first')
-        combined_df.to_csv(transactions_file, index=False)
     else:
-        new_df.to_csv(transactions_file, index=False)
+        combined_df = new_df
+    
+    if _HAS_PYARROW:
+        combined_df.astype({'category': 'category', 'currency': 'category'}).to_parquet(
+            data_dir / TRANSACTIONS_PARQUET, engine='pyarrow', compression='zstd', index=False
+        )
+        # CSV-filens innehåll finns nu i Parquet-filen (eller skrevs över)
+        (data_dir / TRANSACTIONS_CSV).unlink(missing_ok=True)
+    else:
+        combined_df.to_csv(data_dir / TRANSACTIONS_CSV, index=False)
+        # Bara möjligt med append=False; en gammal Parquet-fil skulle
+        # annars få företräde igen när pyarrow installeras
+        (data_dir / TRANSACTIONS_PARQUET).unlink(missing_ok=True)
+
+
+def _stored_transactions_file(data_dir: Path) -> Optional[Path]:
+    """
+    Returnerar filen som sparade transaktioner ska läsas från.
+    
+    Parquet-filen har företräde, annars används CSV-filen. Det finns
+    bara en av dem åt gången (se save_transactions).
+    
+    Args:
+        data_dir: Datakatalogen
+    
+    Returns:
+        Sökväg till transaktionsfilen, eller None om ingen finns
+    
+    Raises:
+        RuntimeError: Om transaktionerna ligger i Parquet-format men
+            pyarrow saknas
+    """
+    parquet_file = data_dir / TRANSACTIONS_PARQUET
+    if parquet_file.exists():
+        if not _HAS_PYARROW:
+            raise RuntimeError(f"{parquet_file} kan inte läsas utan pyarrow")
+        return parquet_file
+    csv_file = data_dir / TRANSACTIONS_CSV
+    return csv_file if csv_file.exists() else None
+
+
+@cached_file_loader(maxsize=2)
+def _read_stored_transactions(path_str: str) -> pd.DataFrame:
+    """
+    Läser transactions.parquet eller transactions.csv, cachad per filversion.
+    
+    CSV-filer läses med pyarrow-motorn om den finns installerad.
+    Datumkolumnen läses som text även med pyarrow, som annars tolkar
+    ISO-datum själv.
+    
+    Args:
+        path_str: Sökväg till Parquet- eller CSV-filen
+    
+    Returns:
+        DataFrame med filens innehåll (delas mellan anrop, får inte muteras)
+    """
+    if path_str.endswith('.parquet'):
+        return pd.read_parquet(path_str, engine='pyarrow')
+    if _HAS_PYARROW:
+        try:
+            df = pd.read_csv(path_str, engine='pyarrow', dtype={'date': str})
+        except Exception:
+            pass
+        else:
+            # Pyarrow ger None för saknade värden i objektkolumner där
+            # standardmotorn ger NaN; str() av dem skiljer sig
+            return df.fillna(np.nan)
+    return pd.read_csv(path_str)
 
 
 def load_transactions() -> List[Transaction]:
     """
-    Läser sparade transaktioner från CSV-fil.
+    Läser sparade transaktioner från Parquet- eller CSV-fil.
     
     Returns:
         Lista med Transaction-objekt
@@ -169,22 +265,41 @@ def load_transactions() -> List[Transaction]:
     from decimal import Decimal
     
     data_dir = Path(__file__).parent.parent / "data"
-    transactions_file = data_dir / "transactions.csv"
+    try:
+        transactions_file = _stored_transactions_file(data_dir)
+    except RuntimeError as e:
+        print(f"Kunde inte läsa transaktioner: {e}")
+        return []
+    
+    if transactions_file is None:
+        return []
+    
+    df = _read_stored_transactions(transactions_file)
     
-    if not transactions_file.exists():
+    missing = [column for column in ('date', 'amount', 'description') if column not in df.columns]
+    if missing:
+        print(f"Kunde inte läsa transaktioner, kolumner saknas: {missing}")
         return []
     
-    df = pd.read_csv(transactions_file)
+    # Valfria kolumner som saknas blir NaN och får standardvärden nedan
+    rows = df.reindex(columns=['date', 'amount', 'description', 'category', 'currency'])
     transactions = []
     
-    for _, row in df.iterrows():
+    # Samma datum återkommer i många transaktioner och strptime är den
+    # dyraste konverteringen per rad, så varje datumsträng tolkas en gång
+    parsed_dates = {}
+    
+    for date_str, amount, description, category, currency in rows.itertuples(index=False, name=None):
         try:
+            trans_date = parsed_dates.get(date_str)
+            if trans_date is None:
+                trans_date = parsed_dates[date_str] = datetime.strptime(date_str, '%Y-%m-%d').date()
             trans = Transaction(
-                date=datetime.strptime(row['date'], '%Y-%m-%d').date(),
-                amount=Decimal(str(row['amount'])),
-                description=str(row['description']),
-                category=str(row['category']) if pd.notna(row.get('category')) else None,
-                currency=str(row['currency']) if pd.notna(row.get('currency')) else 'SEK'
+                date=trans_date,
+                amount=Decimal(str(amount)),
+                description=str(description),
+                category=str(category) if pd.notna(category) else None,
+                currency=str(currency) if pd.notna(currency) else 'SEK'
             )
             transactions.append(trans)
         except Exception as e:
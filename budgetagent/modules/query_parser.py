@@ -14,9 +14,44 @@ Stödjer frågor som:
 
 from typing import Dict, List, Optional, Any
 from datetime import datetime
+from pathlib import Path
 import re
+import yaml
+try:
+    # C-implementerad YAML-parser när PyYAML är byggt mot libyaml
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:
+    from yaml import SafeLoader
+from .file_cache import cached_file_loader
 from .models import Bill, Income, Transaction, ForecastData, Scenario
 from . import upcoming_bills, income_tracker, forecast_engine, alerts_and_insights
+from . import import_bank_data, categorize_expenses
+
+
+# Belopp som "5000", "5000 kr", "5000.50". Kompileras en gång vid
+# modulimport i stället för att slås upp i re:s cache vid varje fråga.
+_AMOUNT_RE = re.compile(r'(\d+(?:[.,]\d+)?)\s*(?:kr|kronor)?')
+
+# Månadsnamn till månadsnummer. Vid flera månader i frågan vinner den
+# som kommer först i kalendern, inte den som står först i texten.
+_MONTHS = {
+    "januari": "01",
+    "februari": "02",
+    "mars": "03",
+    "april": "04",
+    "maj": "05",
+    "juni": "06",
+    "juli": "07",
+    "augusti": "08",
+    "september": "09",
+    "oktober": "10",
+    "november": "11",
+    "december": "12"
+}
+
+# Kända utgiftskategorier. Vid flera i frågan vinner den som står först
+# här, inte den som står först i texten.
+_CATEGORIES = ("mat", "boende", "transport", "nöje", "försäkring", "kläder", "hälsa")
 
 
 class QueryIntent:
@@ -32,6 +67,27 @@ class QueryIntent:
     UNKNOWN = "unknown"
 
 
+# Nyckelord per intent, i prioritetsordning. Första intentet med ett
+# nyckelord i frågan vinner.
+_INTENT_KEYWORDS = (
+    (QueryIntent.SHOW_BILLS, ("faktura", "räkning", "bill", "fakturor")),
+    (QueryIntent.SHOW_INCOME, ("inkomst", "lön", "income")),
+    (QueryIntent.CALCULATE_BALANCE, ("kvar", "saldo", "balance")),
+    (QueryIntent.FORECAST_SCENARIO, ("vad händer om", "scenario", "extra")),
+    (QueryIntent.CATEGORY_SPENDING, ("spenderar", "utgift", "kostnad")),
+    (QueryIntent.ALERT_CHECK, ("varning", "alert", "problem")),
+)
+
+# Parametrar som extraheras för respektive intent, i ordning
+_INTENT_PARAMS = {
+    QueryIntent.SHOW_BILLS: ("month",),
+    QueryIntent.SHOW_INCOME: ("month",),
+    QueryIntent.CALCULATE_BALANCE: ("month",),
+    QueryIntent.FORECAST_SCENARIO: ("amount", "month"),
+    QueryIntent.CATEGORY_SPENDING: ("category",),
+}
+
+
 def parse_query(query: str) -> Dict[str, Any]:
     """
     Parsar användarfråga och identifierar intent och parametrar.
@@ -51,50 +107,20 @@ def parse_query(query: str) -> Dict[str, Any]:
         {"intent": "show_bills", "params": {"month": "december"}}
     """
     query_lower = query.lower()
-    params = {}
     
-    # Identifiera intent baserat på nyckelord
-    if any(word in query_lower for word in ["faktura", "räkning", "bill", "fakturor"]):
-        intent = QueryIntent.SHOW_BILLS
-        # Extrahera månad om specificerad
-        month = extract_month(query_lower)
-        if month:
-            params["month"] = month
-            
-    elif any(word in query_lower for word in ["inkomst", "lön", "income"]):
-        intent = QueryIntent.SHOW_INCOME
-        month = extract_month(query_lower)
-        if month:
-            params["month"] = month
-            
-    elif any(word in query_lower for word in ["kvar", "saldo", "balance"]):
-        intent = QueryIntent.CALCULATE_BALANCE
-        month = extract_month(query_lower)
-        if month:
-            params["month"] = month
-            
-    elif any(word in query_lower for word in ["vad händer om", "scenario", "extra"]):
-        intent = QueryIntent.FORECAST_SCENARIO
-        # Extrahera belopp
-        amount = extract_amount(query_lower)
-        if amount:
-            params["amount"] = amount
-        month = extract_month(query_lower)
-        if month:
-            params["month"] = month
-            
-    elif any(word in query_lower for word in ["spenderar", "utgift", "kostnad"]):
-        intent = QueryIntent.CATEGORY_SPENDING
-        # Extrahera kategori
-        category = extract_category(query_lower)
-        if category:
-            params["category"] = category
-            
-    elif any(word in query_lower for word in ["varning", "alert", "problem"]):
-        intent = QueryIntent.ALERT_CHECK
-        
-    else:
-        intent = QueryIntent.UNKNOWN
+    # Identifiera intent baserat på nyckelord, i prioritetsordning
+    intent = next(
+        (name for name, keywords in _INTENT_KEYWORDS
+         if any(word in query_lower for word in keywords)),
+        QueryIntent.UNKNOWN
+    )
+    
+    # Extrahera parametrarna som hör till intentet (månad, belopp, kategori)
+    params = {}
+    for param in _INTENT_PARAMS.get(intent, ()):
+        value = _PARAM_EXTRACTORS[param](query_lower)
+        if value:
+            params[param] = value
     
     return {
         "intent": intent,
@@ -115,22 +141,7 @@ def extract_month(text: str) -> Optional[str]:
     Returns:
         Månad i format "YYYY-MM" eller månadsnamn, None om ingen månad hittas
     """
-    months = {
-        "januari": "01",
-        "februari": "02",
-        "mars": "03",
-        "april": "04",
-        "maj": "05",
-        "juni": "06",
-        "juli": "07",
-        "augusti": "08",
-        "september": "09",
-        "oktober": "10",
-        "november": "11",
-        "december": "12"
-    }
-    
-    for month_name, month_num in months.items():
+    for month_name, month_num in _MONTHS.items():
         if month_name in text:
             current_year = datetime.now().year
             return f"{current_year}-{month_num}"
@@ -151,9 +162,7 @@ def extract_amount(text: str) -> Optional[float]:
     Returns:
         Belopp som float, None om inget belopp hittas
     """
-    # Matcha belopp som "5000", "5000 kr", "5000.50"
-    pattern = r'(\d+(?:[.,]\d+)?)\s*(?:kr|kronor)?'
-    match = re.search(pattern, text)
+    match = _AMOUNT_RE.search(text)
     
     if match:
         amount_str = match.group(1).replace(',', '.')
@@ -174,15 +183,21 @@ def extract_category(text: str) -> Optional[str]:
     Returns:
         Kategorinamn eller None om ingen kategori hittas
     """
-    categories = ["mat", "boende", "transport", "nöje", "försäkring", "kläder", "hälsa"]
-    
-    for category in categories:
+    for category in _CATEGORIES:
         if category in text:
             return category.capitalize()
     
     return None
 
 
+# Extraktionsfunktion per parameter i _INTENT_PARAMS
+_PARAM_EXTRACTORS = {
+    "month": extract_month,
+    "amount": extract_amount,
+    "category": extract_category,
+}
+
+
 def execute_query(intent: str, params: Dict) -> str:
     """
     Exekverar tolkad fråga och returnerar svar.
@@ -197,24 +212,24 @@ def execute_query(intent: str, params: Dict) -> str:
     Returns:
         Svar som formaterad text
     """
-    if intent == QueryIntent.SHOW_BILLS:
-        return handle_show_bills(params)
-    elif intent == QueryIntent.SHOW_INCOME:
-        return handle_show_income(params)
-    elif intent == QueryIntent.CALCULATE_BALANCE:
-        return handle_calculate_balance(params)
-    elif intent == QueryIntent.FORECAST_SCENARIO:
-        return handle_forecast_scenario(params)
-    elif intent == QueryIntent.CATEGORY_SPENDING:
-        return handle_category_spending(params)
-    elif intent == QueryIntent.ALERT_CHECK:
-        return handle_alert_check(params)
-    else:
-        return ("Jag förstår tyvärr inte frågan. Försök med något som:\n"
-                "- 'Visa alla fakturor i december'\n"
-                "- 'Hur mycket har vi kvar i januari?'\n"
-                "- 'Vad händer om vi får 5000 kr extra?'\n"
-                "- 'Hur mycket spenderar vi på mat per månad?'")
+    return _INTENT_HANDLERS.get(intent, _handle_unknown)(params)
+
+
+def _handle_unknown(params: Dict) -> str:
+    """
+    Svarar på frågor som inte kunde tolkas.
+    
+    Args:
+        params: Parametrar från parse_query() (används inte)
+        
+    Returns:
+        Hjälptext med exempel på frågor
+    """
+    return ("Jag förstår tyvärr inte frågan. Försök med något som:\n"
+            "- 'Visa alla fakturor i december'\n"
+            "- 'Hur mycket har vi kvar i januari?'\n"
+            "- 'Vad händer om vi får 5000 kr extra?'\n"
+            "- 'Hur mycket spenderar vi på mat per månad?'")
 
 
 def handle_show_bills(params: Dict) -> str:
@@ -230,22 +245,22 @@ def handle_show_bills(params: Dict) -> str:
     Returns:
         Formaterad sträng med fakturainformation
     """
-    from . import upcoming_bills
-    
     month = params.get("month")
     bills = upcoming_bills.get_upcoming_bills(month)
     
     if not bills:
         return f"Inga fakturor hittades{' för ' + month if month else ''}."
     
-    result = f"Fakturor{' för ' + month if month else ''}:\n\n"
-    total = 0
-    for bill in bills:
-        result += f"  • {bill.name:20s} {bill.amount:>8.2f} SEK  (förfaller {bill.due_date})\n"
-        total += float(bill.amount)
-    
-    result += f"\nTotalt: {total:.2f} SEK"
-    return result
+    # Rader samlas i en lista och slås ihop en gång i stället för att
+    # svaret byggs upp med += per faktura
+    lines = [f"Fakturor{' för ' + month if month else ''}:\n"]
+    lines.extend(
+        f"  • {bill.name:20s} {bill.amount:>8.2f} SEK  (förfaller {bill.due_date})"
+        for bill in bills
+    )
+    total = sum(float(bill.amount) for bill in bills)
+    lines.append(f"\nTotalt: {total:.2f} SEK")
+    return "\n".join(lines)
 
 
 def handle_show_income(params: Dict) -> str:
@@ -275,33 +290,31 @@ def handle_calculate_balance(params: Dict) -> str:
     Returns:
         Formaterad sträng med saldoinformation
     """
-    from . import forecast_engine
-    from datetime import datetime
-    
     month = params.get("month")
     
-    # Generera prognos
+    # Generera prognos, indexerad på månad (en post per månad)
     forecast = forecast_engine.simulate_monthly_balance(12)
+    by_month = {f.date.strftime('%Y-%m'): f for f in forecast}
     
     if month:
         # Hitta den specifika månaden
-        for f in forecast:
-            if f.date.strftime('%Y-%m') == month:
-                return (f"Prognostiserat saldo för {month}:\n\n"
-                       f"  Saldo: {f.balance:.2f} SEK\n"
-                       f"  Inkomster: {f.income:.2f} SEK\n"
-                       f"  Utgifter: {f.expenses:.2f} SEK\n"
-                       f"  Netto: {f.income - f.expenses:.2f} SEK")
+        f = by_month.get(month)
+        if f is not None:
+            return (f"Prognostiserat saldo för {month}:\n\n"
+                   f"  Saldo: {f.balance:.2f} SEK\n"
+                   f"  Inkomster: {f.income:.2f} SEK\n"
+                   f"  Utgifter: {f.expenses:.2f} SEK\n"
+                   f"  Netto: {f.income - f.expenses:.2f} SEK")
         return f"Ingen prognos tillgänglig för {month}"
     else:
         # Visa nuvarande månad
         current_month = datetime.now().strftime('%Y-%m')
-        for f in forecast:
-            if f.date.strftime('%Y-%m') == current_month:
-                return (f"Prognostiserat saldo för innevarande månad ({current_month}):\n\n"
-                       f"  Saldo: {f.balance:.2f} SEK\n"
-                       f"  Inkomster: {f.income:.2f} SEK\n"
-                       f"  Utgifter: {f.expenses:.2f} SEK")
+        f = by_month.get(current_month)
+        if f is not None:
+            return (f"Prognostiserat saldo för innevarande månad ({current_month}):\n\n"
+                   f"  Saldo: {f.balance:.2f} SEK\n"
+                   f"  Inkomster: {f.income:.2f} SEK\n"
+                   f"  Utgifter: {f.expenses:.2f} SEK")
         return "Ingen prognos tillgänglig för innevarande månad"
 
 
@@ -321,6 +334,22 @@ def handle_forecast_scenario(params: Dict) -> str:
     return f"Om ni får {amount} kr extra i {month}:\n(Implementation krävs)"
 
 
+@cached_file_loader(maxsize=4)
+def _load_categorization_rules(path_str: str) -> Dict:
+    """
+    Läser kategoriseringsregler från YAML-fil, cachad per filversion.
+    
+    Args:
+        path_str: Sökväg till categorization_rules.yaml
+    
+    Returns:
+        Dictionary med kategorier och deras regler (får inte muteras)
+    """
+    with open(path_str, 'r') as f:
+        config = yaml.load(f, Loader=SafeLoader)
+    return config.get('categories', {})
+
+
 def handle_category_spending(params: Dict) -> str:
     """
     Hanterar frågor om utgifter per kategori.
@@ -331,10 +360,6 @@ def handle_category_spending(params: Dict) -> str:
     Returns:
         Formaterad sträng med utgiftsinformation
     """
-    from . import import_bank_data, categorize_expenses
-    from pathlib import Path
-    import yaml
-    
     category = params.get("category", "alla kategorier")
     
     try:
@@ -343,32 +368,32 @@ def handle_category_spending(params: Dict) -> str:
         if data_path.exists():
             # Ladda kategoriseringsregler
             config_path = Path(__file__).parent.parent / "config" / "categorization_rules.yaml"
-            with open(config_path, 'r') as f:
-                config = yaml.safe_load(f)
-                rules = config.get('categories', {})
+            rules = _load_categorization_rules(config_path)
             
             # Importera och kategorisera
             transactions = import_bank_data.import_and_parse(str(data_path))
             categorized = categorize_expenses.categorize_transactions(transactions, rules)
             
-            # Filtrera på kategori om specificerad
-            if category != "alla kategorier":
-                filtered = [t for t in categorized if t.category and t.category.lower() == category.lower()]
-            else:
-                filtered = categorized
-            
-            # Beräkna utgifter (negativa belopp)
-            expenses = [t for t in filtered if t.amount < 0]
+            # Summera utgifter (negativa belopp) i vald kategori i en enda
+            # genomgång. Kategorin casefoldas en gång i stället för per
+            # transaktion; casefold ger skiftlägesoberoende jämförelse
+            # även för tecken där lower() inte räcker.
+            wanted = None if category == "alla kategorier" else category.casefold()
+            total = 0.0
+            count = 0
+            for t in categorized:
+                if t.amount < 0 and (wanted is None or (t.category and t.category.casefold() == wanted)):
+                    total += abs(float(t.amount))
+                    count += 1
             
-            if not expenses:
+            if not count:
                 return f"Inga utgifter hittades för {category}"
             
-            total = sum(abs(float(t.amount)) for t in expenses)
-            avg = total / len(expenses)
+            avg = total / count
             
             return (f"Utgifter för {category}:\n\n"
                    f"  Totalt: {total:.2f} SEK\n"
-                   f"  Antal transaktioner: {len(expenses)}\n"
+                   f"  Antal transaktioner: {count}\n"
                    f"  Genomsnitt per transaktion: {avg:.2f} SEK")
         else:
             return f"Utgifter för {category}: Ingen data tillgänglig"
@@ -389,6 +414,17 @@ def handle_alert_check(params: Dict) -> str:
     return "Aktuella varningar:\n(Implementation krävs)"
 
 
+# Hanterare per intent för execute_query; okända intents får hjälptexten
+_INTENT_HANDLERS = {
+    QueryIntent.SHOW_BILLS: handle_show_bills,
+    QueryIntent.SHOW_INCOME: handle_show_income,
+    QueryIntent.CALCULATE_BALANCE: handle_calculate_balance,
+    QueryIntent.FORECAST_SCENARIO: handle_forecast_scenario,
+    QueryIntent.CATEGORY_SPENDING: handle_category_spending,
+    QueryIntent.ALERT_CHECK: handle_alert_check,
+}
+
+
 def answer_query(query: str) -> str:
     """
     Huvudfunktion för att besvara en användarfråga.
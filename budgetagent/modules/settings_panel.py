@@ -22,9 +22,63 @@ Exempel på YAML-konfiguration (settings_panel.yaml):
 """
 
 from typing import Dict, Optional, List
+from functools import lru_cache
 from pathlib import Path
+import copy
 import yaml
+try:
+    # C-implementerad YAML-parser/emitter när PyYAML är byggt mot libyaml
+    from yaml import CSafeLoader as SafeLoader, CSafeDumper as SafeDumper
+except ImportError:
+    from yaml import SafeLoader, SafeDumper
 from dash import html, dcc
+from .file_cache import cached_file_loader
+
+
+@cached_file_loader(maxsize=16)
+def _parse_settings_file(path_str: str) -> Dict:
+    """
+    Parsar inställningsfilen och returnerar settings_panel-delen.
+    
+    Cachas per filversion så att Dash-callbacks som läser inställningarna
+    vid varje händelse inte parsar om en oförändrad fil. Det returnerade
+    objektet delas mellan anrop och får inte muteras.
+    
+    Args:
+        path_str: Sökväg till YAML-filen
+        
+    Returns:
+        Dictionary med inställningsdefinitionerna, tom om de saknas
+    """
+    with open(path_str, 'r', encoding='utf-8') as f:
+        data = yaml.load(f, Loader=SafeLoader)
+    
+    if not data or 'settings_panel' not in data:
+        return {}
+    
+    return data['settings_panel']
+
+
+def _cached_settings(yaml_path: str) -> Dict:
+    """
+    Hämtar inställningarna via cachen.
+    
+    Args:
+        yaml_path: Sökväg till YAML-konfigurationsfil
+        
+    Returns:
+        Delad dictionary med inställningarna (får inte muteras)
+        
+    Raises:
+        FileNotFoundError: Om YAML-filen inte finns
+        yaml.YAMLError: Om YAML-filen inte kan parsas
+    """
+    try:
+        return _parse_settings_file(yaml_path)
+    except FileNotFoundError:
+        raise FileNotFoundError(f"Inställningsfil hittades inte: {yaml_path}")
+    except yaml.YAMLError as e:
+        raise yaml.YAMLError(f"Kunde inte läsa YAML-fil: {e}")
 
 
 def load_settings(yaml_path: str) -> Dict:
@@ -44,21 +98,24 @@ def load_settings(yaml_path: str) -> Dict:
         FileNotFoundError: Om YAML-filen inte finns
         yaml.YAMLError: Om YAML-filen inte kan parsas
     """
-    yaml_file = Path(yaml_path)
+    # Kopia så att anroparen kan ändra resultatet utan att påverka cachen
+    return copy.deepcopy(_cached_settings(yaml_path))
+
+
+@lru_cache(maxsize=256)
+def _pretty_label(setting_name: str) -> str:
+    """
+    Gör en rubrik av ett inställningsnamn, t.ex. "forecast_months" -> "Forecast Months".
     
-    if not yaml_file.exists():
-        raise FileNotFoundError(f"Inställningsfil hittades inte: {yaml_path}")
+    Cachas eftersom samma namn formateras om vid varje rendering.
     
-    try:
-        with open(yaml_file, 'r', encoding='utf-8') as f:
-            data = yaml.safe_load(f)
-        
-        if not data or 'settings_panel' not in data:
-            return {}
-        
-        return data['settings_panel']
-    except yaml.YAMLError as e:
-        raise yaml.YAMLError(f"Kunde inte läsa YAML-fil: {e}")
+    Args:
+        setting_name: Inställningens nyckel i YAML-filen
+    
+    Returns:
+        Rubrik för visning i panelen
+    """
+    return setting_name.replace('_', ' ').title()
 
 
 def render_controls(settings: Dict) -> List:
@@ -80,7 +137,7 @@ def render_controls(settings: Dict) -> List:
         setting_type = setting_config.get('type')
         
         # Skapa rubrik
-        label = setting_name.replace('_', ' ').title()
+        label = _pretty_label(setting_name)
         components.append(html.H3(label, style={'marginTop': '20px'}))
         
         if setting_type == 'dropdown':
@@ -166,7 +223,7 @@ def update_settings(yaml_path: str, new_values: Dict) -> None:
     try:
         # Läs befintlig konfiguration
         with open(yaml_file, 'r', encoding='utf-8') as f:
-            data = yaml.safe_load(f) or {}
+            data = yaml.load(f, Loader=SafeLoader) or {}
         
         if 'settings_panel' not in data:
             data['settings_panel'] = {}
@@ -180,7 +237,11 @@ def update_settings(yaml_path: str, new_values: Dict) -> None:
         
         # Spara tillbaka
         with open(yaml_file, 'w', encoding='utf-8') as f:
-            yaml.dump(data, f, allow_unicode=True, default_flow_style=False)
+            yaml.dump(data, f, Dumper=SafeDumper, allow_unicode=True, default_flow_style=False)
+        
+        # Filens mtime ändras av skrivningen, men töm cachen ändå ifall
+        # filsystemets tidsupplösning är för grov för att märka det
+        _parse_settings_file.cache_clear()
             
     except yaml.YAMLError as e:
         raise yaml.YAMLError(f"Kunde inte uppdatera YAML-fil: {e}")
@@ -198,12 +259,13 @@ def get_current_values(yaml_path: str) -> Dict:
     Returns:
         Dictionary med aktuella inställningsvärden
     """
-    settings = load_settings(yaml_path)
+    # Läses bara, så den cachade dictionaryn kan användas utan kopia
+    settings = _cached_settings(yaml_path)
     current_values = {}
     
     for setting_name, setting_config in settings.items():
         default_value = setting_config.get('default')
         if default_value is not None:
-            current_values[setting_name] = default_value
+            current_values[setting_name] = copy.deepcopy(default_value)
     
     return current_values
@@ -17,10 +17,160 @@ Exempel på YAML-konfiguration (upcoming_bills.yaml):
           category: "Boende"
 """
 
-from typing import List, Dict
+from typing import List, Dict, Tuple
+from datetime import datetime
+from decimal import Decimal
+from pathlib import Path
+import copy
+import os
+import yaml
+try:
+    # C-implementerad YAML-parser/emitter när PyYAML är byggt mot libyaml
+    from yaml import CSafeLoader as SafeLoader, CSafeDumper as SafeDumper
+except ImportError:
+    from yaml import SafeLoader, SafeDumper
+from .file_cache import cached_file_loader
 from .models import Bill
 
 
+# Sökväg till YAML-filen med kommande fakturor
+CONFIG_PATH = Path(__file__).resolve().parent.parent / "config" / "upcoming_bills.yaml"
+
+
+@cached_file_loader(maxsize=4)
+def _load_bills_data(path_str: str) -> Dict:
+    """
+    Läser och tolkar upcoming_bills.yaml, cachad per filversion.
+    
+    Args:
+        path_str: Sökväg till YAML-filen (måste finnas)
+    
+    Returns:
+        Filens innehåll som dictionary (delas mellan anrop, får inte muteras)
+    """
+    with open(path_str, 'r', encoding='utf-8') as f:
+        return yaml.load(f, Loader=SafeLoader) or {}
+
+
+def _bill_from_dict(bill_dict: Dict) -> Bill:
+    """
+    Konverterar en faktura från YAML-filen till ett Bill-objekt.
+    
+    Args:
+        bill_dict: Faktura som dictionary
+    
+    Returns:
+        Validerat Bill-objekt
+    """
+    payment_date = None
+    if 'payment_date' in bill_dict and bill_dict['payment_date']:
+        payment_date = datetime.fromisoformat(bill_dict['payment_date']).date()
+    
+    return Bill(
+        name=bill_dict['name'],
+        amount=Decimal(str(bill_dict['amount'])),
+        due_date=datetime.fromisoformat(bill_dict['due_date']).date(),
+        category=bill_dict['category'],
+        account=bill_dict.get('account'),
+        recurring=bill_dict.get('recurring', False),
+        frequency=bill_dict.get('frequency'),
+        paid=bill_dict.get('paid', False),
+        payment_date=payment_date
+    )
+
+
+@cached_file_loader(maxsize=4)
+def _load_bills(path_str: str) -> Tuple[Bill, ...]:
+    """
+    Bygger Bill-objekt för alla fakturor i upcoming_bills.yaml.
+    
+    Fakturorna valideras bara om när filen har ändrats. Fakturor som inte
+    kan tolkas hoppas över.
+    
+    Args:
+        path_str: Sökväg till YAML-filen (måste finnas)
+    
+    Returns:
+        Tuple med Bill-objekt (delas mellan anrop)
+    """
+    data = _load_bills_data(path_str)
+    
+    if 'upcoming_bills' not in data or 'bills' not in data['upcoming_bills']:
+        return ()
+    
+    bills = []
+    for bill_dict in data['upcoming_bills']['bills']:
+        try:
+            bills.append(_bill_from_dict(bill_dict))
+        except Exception as e:
+            print(f"Kunde inte parsa faktura: {e}")
+            continue
+    
+    return tuple(bills)
+
+
+@cached_file_loader(maxsize=4)
+def _load_bills_by_month(path_str: str) -> Dict[str, Tuple[Bill, ...]]:
+    """
+    Grupperar fakturorna i upcoming_bills.yaml per förfallomånad.
+    
+    Indexet byggs bara om när filen har ändrats. Inom varje månad behålls
+    filens ordning.
+    
+    Args:
+        path_str: Sökväg till YAML-filen (måste finnas)
+    
+    Returns:
+        Dictionary från månad (YYYY-MM) till tuple med Bill-objekt
+        (delas mellan anrop, får inte muteras)
+    """
+    by_month = {}
+    for bill in _load_bills(path_str):
+        by_month.setdefault(bill.due_date.strftime('%Y-%m'), []).append(bill)
+    
+    return {month: tuple(bills) for month, bills in by_month.items()}
+
+
+def save_bills_data(config_path: Path, data: Dict) -> None:
+    """
+    Skriver fakturadata atomärt till upcoming_bills.yaml och tömmer läscachen.
+    
+    Alla som skriver till fakturafilen (även parse_pdf_bills.BillWriter)
+    ska gå via denna funktion, så att läscachen aldrig blir inaktuell.
+    
+    Datan skrivs först till en temporär fil som synkas till disk och
+    sedan byter plats med målfilen via os.replace, så att ett avbrott mitt
+    i skrivningen lämnar den gamla filen orörd.
+    
+    Cachen töms explicit eftersom mtime kan ha grov upplösning på vissa
+    filsystem, och en ändring med samma filstorlek annars inte skulle synas.
+    
+    Args:
+        config_path: Sökväg till YAML-filen
+        data: Fakturadata att spara
+    """
+    tmp_path = config_path.with_suffix(config_path.suffix + '.tmp')
+    
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        yaml.dump(data, f, Dumper=SafeDumper, allow_unicode=True, default_flow_style=False)
+        f.flush()
+        os.fsync(f.fileno())
+    
+    os.replace(tmp_path, config_path)
+    
+    # Synka katalogen så att namnbytet överlever ett strömavbrott (POSIX)
+    if hasattr(os, 'O_DIRECTORY'):
+        dir_fd = os.open(config_path.parent, os.O_RDONLY | os.O_DIRECTORY)
+        try:
+            os.fsync(dir_fd)
+        finally:
+            os.close(dir_fd)
+    
+    _load_bills_data.cache_clear()
+    _load_bills.cache_clear()
+    _load_bills_by_month.cache_clear()
+
+
 def add_bill(bill: Bill) -> None:
     """
     Lägger till ny faktura i YAML.
@@ -31,17 +181,12 @@ def add_bill(bill: Bill) -> None:
     Args:
         bill: Bill-objekt med fakturainformation
     """
-    import yaml
-    from pathlib import Path
-    
-    config_path = Path(__file__).parent.parent / "config" / "upcoming_bills.yaml"
-    
-    # Ladda befintliga fakturor
-    if config_path.exists():
-        with open(config_path, 'r', encoding='utf-8') as f:
-            data = yaml.safe_load(f) or {}
+    # Ladda befintliga fakturor (kopia, eftersom data ändras nedan)
+    if CONFIG_PATH.exists():
+        original = _load_bills_data(CONFIG_PATH)
     else:
-        data = {}
+        original = {}
+    data = copy.deepcopy(original)
     
     if 'upcoming_bills' not in data:
         data['upcoming_bills'] = {'bills': []}
@@ -73,10 +218,13 @@ def add_bill(bill: Bill) -> None:
     if not duplicate:
         data['upcoming_bills']['bills'].append(bill_dict)
     
+    # Skriv inte om filen om inget har ändrats (dubblett i en befintlig fil)
+    if data == original:
+        return
+    
     # Spara tillbaka
-    config_path.parent.mkdir(parents=True, exist_ok=True)
-    with open(config_path, 'w', encoding='utf-8') as f:
-        yaml.dump(data, f, allow_unicode=True, default_flow_style=False)
+    CONFIG_PATH.parent.mkdir(parents=True, exist_ok=True)
+    save_bills_data(CONFIG_PATH, data)
 
 
 def get_upcoming_bills(month: str) -> List[Bill]:
@@ -91,56 +239,16 @@ def get_upcoming_bills(month: str) -> List[Bill]:
     Returns:
         Lista med Bill-objekt
     """
-    import yaml
-    from pathlib import Path
-    from datetime import datetime
-    from decimal import Decimal
-    
-    config_path = Path(__file__).parent.parent / "config" / "upcoming_bills.yaml"
-    
-    if not config_path.exists():
+    if not CONFIG_PATH.exists():
         return []
     
-    with open(config_path, 'r', encoding='utf-8') as f:
-        data = yaml.safe_load(f) or {}
-    
-    if 'upcoming_bills' not in data or 'bills' not in data['upcoming_bills']:
-        return []
+    # Bill-objekten byggs en gång per filversion och delas mellan anrop
+    # (Bill är oföränderlig); bara listan är ny för varje anrop
+    if month:
+        # Slå upp månaden i indexet i stället för att gå igenom alla fakturor
+        return list(_load_bills_by_month(CONFIG_PATH).get(month, ()))
     
-    bills = []
-    for bill_dict in data['upcoming_bills']['bills']:
-        try:
-            # Parsa due_date
-            due_date = datetime.fromisoformat(bill_dict['due_date']).date()
-            
-            # Filtrera på månad om specificerat
-            if month:
-                bill_month = due_date.strftime('%Y-%m')
-                if bill_month != month:
-                    continue
-            
-            # Konvertera till Bill-objekt
-            payment_date = None
-            if 'payment_date' in bill_dict and bill_dict['payment_date']:
-                payment_date = datetime.fromisoformat(bill_dict['payment_date']).date()
-            
-            bill = Bill(
-                name=bill_dict['name'],
-                amount=Decimal(str(bill_dict['amount'])),
-                due_date=due_date,
-                category=bill_dict['category'],
-                account=bill_dict.get('account'),
-                recurring=bill_dict.get('recurring', False),
-                frequency=bill_dict.get('frequency'),
-                paid=bill_dict.get('paid', False),
-                payment_date=payment_date
-            )
-            bills.append(bill)
-        except Exception as e:
-            print(f"Kunde inte parsa faktura: {e}")
-            continue
-    
-    return bills
+    return list(_load_bills(CONFIG_PATH))
 
 
 def get_all_bills() -> List[Bill]:
@@ -150,50 +258,10 @@ def get_all_bills() -> List[Bill]:
     Returns:
         Lista med alla Bill-objekt
     """
-    import yaml
-    from pathlib import Path
-    from datetime import datetime
-    from decimal import Decimal
-    
-    config_path = Path(__file__).parent.parent / "config" / "upcoming_bills.yaml"
-    
-    if not config_path.exists():
-        return []
-    
-    with open(config_path, 'r', encoding='utf-8') as f:
-        data = yaml.safe_load(f) or {}
-    
-    if 'upcoming_bills' not in data or 'bills' not in data['upcoming_bills']:
+    if not CONFIG_PATH.exists():
         return []
     
-    bills = []
-    for bill_dict in data['upcoming_bills']['bills']:
-        try:
-            # Parsa due_date
-            due_date = datetime.fromisoformat(bill_dict['due_date']).date()
-            
-            # Konvertera till Bill-objekt
-            payment_date = None
-            if 'payment_date' in bill_dict and bill_dict['payment_date']:
-                payment_date = datetime.fromisoformat(bill_dict['payment_date']).date()
-            
-            bill = Bill(
-                name=bill_dict['name'],
-                amount=Decimal(str(bill_dict['amount'])),
-                due_date=due_date,
-                category=bill_dict['category'],
-                account=bill_dict.get('account'),
-                recurring=bill_dict.get('recurring', False),
-                frequency=bill_dict.get('frequency'),
-                paid=bill_dict.get('paid', False),
-                payment_date=payment_date
-            )
-            bills.append(bill)
-        except Exception as e:
-            print(f"Kunde inte parsa faktura: {e}")
-            continue
-    
-    return bills
+    return list(_load_bills(CONFIG_PATH))
 
 
 def update_bill(old_bill_name: str, old_bill_due_date: str, updated_bill: Bill) -> bool:
@@ -208,16 +276,11 @@ def update_bill(old_bill_name: str, old_bill_due_date: str, updated_bill: Bill)
     Returns:
         True om uppdateringen lyckades, False annars
     """
-    import yaml
-    from pathlib import Path
-    
-    config_path = Path(__file__).parent.parent / "config" / "upcoming_bills.yaml"
-    
-    if not config_path.exists():
+    if not CONFIG_PATH.exists():
         return False
     
-    with open(config_path, 'r', encoding='utf-8') as f:
-        data = yaml.safe_load(f) or {}
+    original = _load_bills_data(CONFIG_PATH)
+    data = copy.deepcopy(original)
     
     if 'upcoming_bills' not in data or 'bills' not in data['upcoming_bills']:
         return False
@@ -244,9 +307,9 @@ def update_bill(old_bill_name: str, old_bill_due_date: str, updated_bill: Bill)
             updated = True
             break
     
-    if updated:
-        with open(config_path, 'w', encoding='utf-8') as f:
-            yaml.dump(data, f, allow_unicode=True, default_flow_style=False)
+    # Skriv bara om filen om fakturan faktiskt har ändrats
+    if updated and data != original:
+        save_bills_data(CONFIG_PATH, data)
     
     return updated
 
@@ -262,16 +325,10 @@ def delete_bill(bill_name: str, bill_due_date: str) -> bool:
     Returns:
         True om borttagningen lyckades, False annars
     """
-    import yaml
-    from pathlib import Path
-    
-    config_path = Path(__file__).parent.parent / "config" / "upcoming_bills.yaml"
-    
-    if not config_path.exists():
+    if not CONFIG_PATH.exists():
         return False
     
-    with open(config_path, 'r', encoding='utf-8') as f:
-        data = yaml.safe_load(f) or {}
+    data = copy.deepcopy(_load_bills_data(CONFIG_PATH))
     
     if 'upcoming_bills' not in data or 'bills' not in data['upcoming_bills']:
         return False
@@ -286,8 +343,7 @@ def delete_bill(bill_name: str, bill_due_date: str) -> bool:
     deleted = len(data['upcoming_bills']['bills']) < original_count
     
     if deleted:
-        with open(config_path, 'w', encoding='utf-8') as f:
-            yaml.dump(data, f, allow_unicode=True, default_flow_style=False)
+        save_bills_data(CONFIG_PATH, data)
     
     return deleted
 
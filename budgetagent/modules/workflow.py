@@ -313,10 +313,9 @@ def load_alert_config() -> AlertConfig:
         AlertConfig-objekt
     """
     # Placeholder
-    from decimal import Decimal
     return AlertConfig(
         threshold_percentage=80,
         category_limits={},
         alert_days_before_due=7,
-        min_balance_warning=Decimal(1000)
+        min_balance_warning=1000.0
     )
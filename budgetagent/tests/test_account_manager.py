@@ -117,6 +117,39 @@ class TestAccountManagement:
         assert len(loaded_accounts["TEST_KONTO"].transaction_hashes) == 3
         assert "hash1" in loaded_accounts["TEST_KONTO"].transaction_hashes
 
+    def test_save_hashes_replaces_file_atomically(self, setup_temp_db):
+        """Test att hash-filen skrivs via en temporär fil som byter plats med den gamla."""
+        account = Account(
+            account_name="TEST_KONTO",
+            account_number="1234567890",
+            imported_files=[],
+            transaction_hashes={"hash1"}
+        )
+        account_manager.save_accounts({"TEST_KONTO": account})
+        account.transaction_hashes.add("hash2")
+        account_manager.save_accounts({"TEST_KONTO": account})
+        
+        assert list(setup_temp_db.parent.glob("*.tmp")) == []
+        assert account_manager.load_accounts()["TEST_KONTO"].transaction_hashes == {"hash1", "hash2"}
+
+    def test_load_legacy_hashes_from_yaml(self):
+        """Test att hasher i äldre accounts.yaml fortfarande läses in."""
+        account_manager.ACCOUNTS_DB_PATH.write_text(
+            "accounts:\n"
+            "  TEST_KONTO:\n"
+            "    account_name: TEST_KONTO\n"
+            "    transaction_hashes: [hash1, hash2]\n",
+            encoding='utf-8'
+        )
+
+        accounts = account_manager.load_accounts()
+        assert accounts["TEST_KONTO"].transaction_hashes == {"hash1", "hash2"}
+
+        # Vid nästa sparning flyttas hasherna till JSON-filen
+        account_manager.save_accounts(accounts)
+        assert "transaction_hashes" not in account_manager.ACCOUNTS_DB_PATH.read_text(encoding='utf-8')
+        assert account_manager.load_accounts()["TEST_KONTO"].transaction_hashes == {"hash1", "hash2"}
+
 
 class TestFileImportTracking:
     """Tester för filimport-spårning."""
@@ -0,0 +1,68 @@
+"""
+Test för file_cache-modulen.
+
+Testsuite för cachning av filinläsning per filversion.
+"""
+
+import pytest
+
+from budgetagent.modules import file_cache
+
+
+class TestFileKey:
+    """Tester för file_key."""
+
+    def test_file_key_for_existing_file(self, tmp_path):
+        """Test att nyckeln innehåller sökväg och storlek."""
+        path = tmp_path / "data.txt"
+        path.write_text("abc", encoding="utf-8")
+
+        key = file_cache.file_key(path)
+
+        assert key[0] == str(path)
+        assert key[2] == 3
+
+    def test_file_key_for_missing_file(self, tmp_path):
+        """Test att en saknad fil ger None."""
+        assert file_cache.file_key(tmp_path / "saknas.txt") is None
+
+
+class TestCachedFileLoader:
+    """Tester för cached_file_loader."""
+
+    def test_loader_runs_once_per_file_version(self, tmp_path):
+        """Test att filen bara läses om när den har ändrats."""
+        calls = []
+
+        @file_cache.cached_file_loader(maxsize=2)
+        def load(path_str):
+            calls.append(path_str)
+            with open(path_str, encoding="utf-8") as f:
+                return f.read()
+
+        path = tmp_path / "data.txt"
+        path.write_text("abc", encoding="utf-8")
+
+        assert load(path) == "abc"
+        assert load(str(path)) == "abc"
+        assert len(calls) == 1
+
+        # Ny storlek ger ny nyckel
+        path.write_text("abcd", encoding="utf-8")
+        assert load(path) == "abcd"
+        assert len(calls) == 2
+
+        # Samma storlek kan ha samma mtime; cache_clear tvingar omläsning
+        path.write_text("wxyz", encoding="utf-8")
+        load.cache_clear()
+        assert load(path) == "wxyz"
+        assert load.for_key(file_cache.file_key(path)) == "wxyz"
+
+    def test_loader_raises_for_missing_file(self, tmp_path):
+        """Test att en saknad fil ger FileNotFoundError."""
+        @file_cache.cached_file_loader()
+        def load(path_str):
+            return path_str
+
+        with pytest.raises(FileNotFoundError):
+            load(tmp_path / "saknas.txt")
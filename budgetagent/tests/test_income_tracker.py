@@ -8,13 +8,21 @@ per person, både återkommande och engångsinkomster.
 import pytest
 import yaml
 from pathlib import Path
+from datetime import date
+from decimal import Decimal
 
-# Funktioner att testa (importeras när de är implementerade)
-# from budgetagent.modules.income_tracker import (
-#     add_income,
-#     get_monthly_income,
-#     forecast_income,
-# )
+from budgetagent.modules import income_tracker
+from budgetagent.modules.models import Income
+
+
+@pytest.fixture
+def income_files(tmp_path, monkeypatch):
+    """Pekar om income_tracker till temporära filer."""
+    config_path = tmp_path / "income_tracker.yaml"
+    log_path = tmp_path / "incomes.jsonl"
+    monkeypatch.setattr(income_tracker, "CONFIG_PATH", config_path)
+    monkeypatch.setattr(income_tracker, "INCOME_LOG_PATH", log_path)
+    return config_path, log_path
 
 
 class TestLoadIncomeData:
@@ -44,10 +52,21 @@ class TestLoadIncomeData:
 class TestCalculateMonthlyIncome:
     """Tester för calculate_monthly_income-funktionen."""
 
-    def test_calculate_recurring_income(self):
+    def test_calculate_recurring_income(self, income_files):
         """Test att beräkna månadsinkomst från återkommande inkomster."""
-        # TODO: Implementera test när calculate_monthly_income är implementerad
-        pass
+        income_tracker.add_income(Income(
+            person="Robin", source="Lön", amount=Decimal("28000"),
+            date=date(2025, 1, 25), recurring=True, frequency="monthly"
+        ))
+        income_tracker.add_income(Income(
+            person="Robin", source="Lön", amount=Decimal("30000"),
+            date=date(2025, 6, 25), recurring=True, frequency="monthly"
+        ))
+
+        assert income_tracker.get_monthly_income("Robin", "2024-12") == 0.0
+        assert income_tracker.get_monthly_income("Robin", "2025-03") == 28000.0
+        # Den senaste lönen per källa ersätter den tidigare
+        assert income_tracker.get_monthly_income("Robin", "2025-07") == 30000.0
 
     def test_calculate_total_household_income(self):
         """Test att beräkna total hushållsinkomst."""
@@ -73,15 +92,37 @@ class TestCalculateMonthlyIncome:
 class TestAddOneTimeIncome:
     """Tester för add_one_time_income-funktionen."""
 
-    def test_add_single_one_time_income(self):
+    def test_add_single_one_time_income(self, income_files):
         """Test att lägga till en engångsinkomst."""
-        # TODO: Implementera test när add_one_time_income är implementerad
-        pass
+        income_tracker.add_income(Income(
+            person="Robin", source="Frilans", amount=Decimal("5000"),
+            date=date(2025, 12, 10)
+        ))
+
+        assert income_tracker.get_monthly_income("Robin", "2025-12") == 5000.0
+        assert income_tracker.get_monthly_income("Robin", "2026-01") == 0.0
+        assert income_tracker.get_monthly_income("Partner", "2025-12") == 0.0
 
-    def test_add_multiple_one_time_incomes(self):
+    def test_add_multiple_one_time_incomes(self, income_files, monkeypatch):
         """Test att lägga till flera engångsinkomster."""
-        # TODO: Implementera test när add_one_time_income är implementerad
-        pass
+        config_path, log_path = income_files
+
+        income_tracker.add_income(Income(
+            person="Robin", source="Frilans", amount=Decimal("5000"),
+            date=date(2025, 12, 10)
+        ))
+        # Tvinga kompaktering vid nästa tillägg
+        monkeypatch.setattr(income_tracker, "_COMPACT_THRESHOLD_BYTES", 0)
+        income_tracker.add_income(Income(
+            person="Robin", source="Bonus", amount=Decimal("2500"),
+            date=date(2025, 12, 20)
+        ))
+
+        assert not log_path.exists()
+        with open(config_path, "r", encoding="utf-8") as f:
+            data = yaml.safe_load(f)
+        assert len(data["income_tracker"]["incomes"]) == 2
+        assert income_tracker.get_monthly_income("Robin", "2025-12") == 7500.0
 
     def test_add_income_with_future_date(self):
         """Test att lägga till inkomst med framtida datum."""
@@ -66,6 +66,53 @@ class TestNordeaImport:
         assert income_transaction.amount == Decimal('28000.00')
         assert income_transaction.amount > 0, "Lön borde vara positiv"
 
+    def test_iter_transactions_in_chunks(self, nordea_csv_path):
+        """Test att blockvis läsning ger samma transaktioner som hel läsning."""
+        expected, _ = import_bank_data.parse_bank_file(nordea_csv_path)
+
+        transactions = list(import_bank_data.iter_transactions(nordea_csv_path, chunksize=2))
+
+        assert transactions == expected
+
+    def test_iter_transactions_mapping_independent_of_chunksize(self, tmp_path):
+        """Test att blockvis läsning ger samma beskrivningar när Rubrik är tom i senare rader."""
+        csv_content = """Bokföringsdag;Belopp;Namn;Rubrik;Valuta
+2025/01/15;-350,50;ICA Namn;ICA Rubrik;SEK
+2025/01/16;-120,00;Coop Namn;Coop Rubrik;SEK
+2025/01/17;-39,00;SL Namn;;SEK
+2025/01/18;-150,00;Bio Namn;;SEK"""
+        
+        file_path = tmp_path / "nordea_partial_rubrik.csv"
+        file_path.write_text(csv_content, encoding='utf-8')
+        
+        expected, _ = import_bank_data.parse_bank_file(str(file_path))
+        
+        for chunksize in (2, 50_000):
+            transactions = list(import_bank_data.iter_transactions(str(file_path), chunksize=chunksize))
+            assert transactions == expected
+        assert [t.description for t in expected] == [
+            'ICA Rubrik', 'Coop Rubrik', 'Transaktion', 'Transaktion'
+        ]
+
+    def test_mixed_date_formats_are_parsed_per_row(self, tmp_path, capsys):
+        """Test att rader med olika datumformat inte tappas, och att ogiltiga rader rapporteras."""
+        csv_content = """Bokföringsdatum,Belopp,Rubrik,Valuta
+2025-01-15,-350.50,Matinköp,SEK
+2025-01-16 10:30,-120.00,Bensin,SEK
+16 jan 2025,-75.00,Apotek,SEK
+2025/01/17,-40.00,Kiosk,SEK
+inte ett datum,-10.00,Okänt,SEK"""
+        
+        file_path = tmp_path / "nordea_mixed_dates.csv"
+        file_path.write_text(csv_content, encoding='utf-8')
+        
+        transactions, _ = import_bank_data.parse_bank_file(str(file_path))
+        
+        assert [t.date for t in transactions] == [
+            date(2025, 1, 15), date(2025, 1, 16), date(2025, 1, 16), date(2025, 1, 17)
+        ]
+        assert "Kunde inte parsa transaktion på rad 4: ogiltigt datum" in capsys.readouterr().out
+
     def test_import_empty_nordea_file(self, tmp_path):
         """Edge case: Tom Nordea CSV-fil."""
         empty_file = tmp_path / "empty_nordea.csv"
@@ -118,6 +165,7 @@ class TestNordeaImport:
         temp_accounts_path = tmp_path / "accounts.yaml"
         from budgetagent.modules import account_manager
         monkeypatch.setattr(account_manager, 'ACCOUNTS_DB_PATH', temp_accounts_path)
+        monkeypatch.setattr(account_manager, 'IMPORTS_INDEX_PATH', tmp_path / "imports_index.yaml")
         
         # Skapa en testfil
         csv_content = """Bokföringsdatum,Valutadatum,Belopp,Avsändare,Mottagare,Rubrik,Valuta
@@ -141,6 +189,7 @@ class TestNordeaImport:
         temp_accounts_path = tmp_path / "accounts.yaml"
         from budgetagent.modules import account_manager
         monkeypatch.setattr(account_manager, 'ACCOUNTS_DB_PATH', temp_accounts_path)
+        monkeypatch.setattr(account_manager, 'IMPORTS_INDEX_PATH', tmp_path / "imports_index.yaml")
         
         # Skapa första filen med samma kontonamn i filnamnet
         csv_content1 = """Bokföringsdatum,Valutadatum,Belopp,Avsändare,Mottagare,Rubrik,Valuta
@@ -166,3 +215,31 @@ class TestNordeaImport:
         transactions2 = import_bank_data.import_and_parse(str(file_path2))
         assert len(transactions2) == 1, "Andra importen borde ge 1 ny transaktion (en är dubblett)"
         assert transactions2[0].amount == Decimal('-75.00'), "Den nya transaktionen borde vara från Apotek"
+
+    def test_import_many_filters_duplicates_across_files(self, tmp_path, monkeypatch):
+        """Test att flera filer kan importeras i en batch utan dubbletter mellan filerna."""
+        temp_accounts_path = tmp_path / "accounts.yaml"
+        from budgetagent.modules import account_manager
+        monkeypatch.setattr(account_manager, 'ACCOUNTS_DB_PATH', temp_accounts_path)
+        monkeypatch.setattr(account_manager, 'IMPORTS_INDEX_PATH', tmp_path / "imports_index.yaml")
+        
+        csv_content1 = """Bokföringsdatum,Valutadatum,Belopp,Avsändare,Mottagare,Rubrik,Valuta
+2025-01-15,2025-01-15,-350.50,Robin Eklund,ICA Maxi,Matinköp,SEK
+2025-01-16,2025-01-16,-120.00,Robin Eklund,Circle K,Bensin,SEK"""
+        csv_content2 = """Bokföringsdatum,Valutadatum,Belopp,Avsändare,Mottagare,Rubrik,Valuta
+2025-01-16,2025-01-16,-120.00,Robin Eklund,Circle K,Bensin,SEK
+2025-01-17,2025-01-17,-75.00,Robin Eklund,Apotek,Medicin,SEK"""
+        
+        file_path1 = tmp_path / "PERSONKONTO 5678 - 2025-01-15.csv"
+        file_path1.write_text(csv_content1, encoding='utf-8')
+        file_path2 = tmp_path / "PERSONKONTO 5678 - 2025-01-17.csv"
+        file_path2.write_text(csv_content2, encoding='utf-8')
+        
+        results = import_bank_data.import_many([str(file_path1), str(file_path2)])
+        
+        assert [len(r) for r in results] == [2, 1]
+        assert results[1][0].amount == Decimal('-75.00')
+        
+        # En andra batch med samma filer ska inte ge några nya transaktioner
+        results = import_bank_data.import_many([str(file_path1), str(file_path2)])
+        assert results == [[], []]
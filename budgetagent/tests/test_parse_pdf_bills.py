@@ -10,6 +10,8 @@ from pathlib import Path
 from datetime import date
 from decimal import Decimal
 from budgetagent.modules.parse_pdf_bills import (
+    BillWriter,
+    extract_bills_from_dir,
     extract_bills_from_text,
     validate_bill_structure,
     write_bills_to_yaml
@@ -119,6 +121,43 @@ class TestExtractBillsFromText:
         if bills:
             assert bills[0].amount == Decimal('1234.56')
 
+    def test_extract_from_page_iterable(self):
+        """Test att fält kan hämtas från olika sidor."""
+        pages = [
+            "Faktura: Elräkning\nBelopp: 900 kr",
+            "",
+            "Förfallodatum: 2025-11-30",
+        ]
+
+        bills = extract_bills_from_text(iter(pages), "Boende")
+
+        assert len(bills) == 1
+        assert bills[0].amount == Decimal('900')
+        assert bills[0].due_date == date(2025, 11, 30)
+
+    def test_stop_early_skips_remaining_pages(self):
+        """Test att sidläsningen avbryts när fälten inte längre kan ändras."""
+        def pages():
+            yield "Faktura: Elräkning\nBelopp: 900 kr\nFörfallodatum: 2025-11-30\nSida 1"
+            raise AssertionError("Sida 2 skulle inte ha lästs")
+
+        bills = extract_bills_from_text(pages(), "Boende", stop_early=True)
+
+        assert len(bills) == 1
+        assert bills[0].name == "Elräkning"
+        assert bills[0].amount == Decimal('900')
+
+    def test_stop_early_keeps_reading_for_higher_priority_amount(self):
+        """Test att ett belopp med högre prioritet på en senare sida fortfarande hittas."""
+        pages = [
+            "Faktura: Elräkning\nAtt betala: 500 kr\nFörfallodatum: 2025-11-30\n",
+            "Belopp: 900 kr\n",
+        ]
+
+        bills = extract_bills_from_text(iter(pages), "Boende", stop_early=True)
+
+        assert bills[0].amount == extract_bills_from_text(iter(pages), "Boende")[0].amount
+
 
 class TestValidateBillStructure:
     """Tester för validate_bill_structure-funktionen."""
@@ -182,7 +221,19 @@ class TestValidateBillStructure:
         )
         
         assert validate_bill_structure(bill) is True
-    
+
+    def test_payment_date_before_due_date_rejected(self):
+        """Test att betalningsdatum före förfallodatum avvisas, även från strängar."""
+        with pytest.raises(ValueError):
+            Bill(
+                name="Internet",
+                amount=Decimal('399'),
+                due_date="2025-11-15",
+                category="Boende",
+                paid=True,
+                payment_date="2025-11-14"
+            )
+
     def test_validate_paid_bill_without_payment_date(self):
         """Test att avvisa betald faktura utan betalningsdatum."""
         bill = Bill(
@@ -327,6 +378,26 @@ class TestWriteBillsToYaml:
         # Endast den giltiga fakturan bör sparas
         assert len(data['upcoming_bills']['bills']) == 1
         assert data['upcoming_bills']['bills'][0]['name'] == "Elräkning"
+    
+    def test_bill_writer_batches_several_pdfs(self, tmp_path):
+        """Test att BillWriter ger samma fil som en skrivning per PDF."""
+        batch_file = tmp_path / "batch.yaml"
+        single_file = tmp_path / "single.yaml"
+        
+        el = Bill(name="Elräkning", amount=Decimal('900'), due_date=date(2025, 11, 30), category="Boende")
+        net = Bill(name="Internet", amount=Decimal('399'), due_date=date(2025, 11, 15), category="Boende")
+        bills_per_pdf = [[el], [net, el]]
+        
+        with BillWriter(str(batch_file)) as writer:
+            assert [writer.add(bills) for bills in bills_per_pdf] == [1, 1]
+            # Inget skrivs förrän blocket stängs
+            assert not batch_file.exists()
+        
+        for bills in bills_per_pdf:
+            write_bills_to_yaml(bills, str(single_file))
+        
+        assert writer.added_count == 2
+        assert batch_file.read_text(encoding='utf-8') == single_file.read_text(encoding='utf-8')
 
 
 class TestIntegration:
@@ -355,3 +426,19 @@ class TestIntegration:
         
         if bills:  # Om parsing lyckades
             assert len(data['upcoming_bills']['bills']) >= 1
+
+    def test_extract_bills_from_dir_keeps_order(self, tmp_path):
+        """Test att batchparsning ger en lista per fil, även i processpoolen."""
+        # Filer som inte går att läsa ger en tom lista istället för ett fel
+        paths = [str(tmp_path / f"saknas_{i}.pdf") for i in range(5)]
+
+        assert extract_bills_from_dir(paths[:2]) == [[], []]
+        assert extract_bills_from_dir(paths, max_workers=2) == [[]] * 5
+        assert extract_bills_from_dir(tmp_path) == []
+
+    def test_extract_bills_from_dir_single_file(self, tmp_path):
+        """Test att en enskild filsökväg behandlas som en fil, inte som en teckensekvens."""
+        pdf_path = tmp_path / "faktura.pdf"
+
+        assert extract_bills_from_dir(str(pdf_path)) == [[]]
+        assert extract_bills_from_dir(pdf_path) == [[]]
@@ -93,6 +93,18 @@ class TestLoadSettings:
         
         settings = load_settings(str(no_key_file))
         assert settings == {}
+    
+    def test_load_settings_cache_follows_updates(self, temp_settings_file):
+        """Test att cachade inställningar inte kan muteras och följer ändringar."""
+        settings = load_settings(str(temp_settings_file))
+        settings['forecast_window']['default'] = 99
+        
+        assert get_current_values(str(temp_settings_file))['forecast_window'] == 6
+        
+        update_settings(str(temp_settings_file), {'forecast_window': 9})
+        
+        assert load_settings(str(temp_settings_file))['forecast_window']['default'] == 9
+        assert get_current_values(str(temp_settings_file))['forecast_window'] == 9
 
 
 class TestRenderControls:
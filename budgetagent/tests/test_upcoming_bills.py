@@ -189,3 +189,33 @@ class TestIntegration:
         """Test att hantera återkommande fakturor."""
         # TODO: Implementera test för återkommande fakturor
         pass
+
+    def test_cached_bills_follow_writes(self, tmp_path, monkeypatch):
+        """Test att cachade fakturor och månadsindexet följer ändringar i filen."""
+        from decimal import Decimal
+        from budgetagent.modules import upcoming_bills
+        from budgetagent.modules.models import Bill
+
+        monkeypatch.setattr(upcoming_bills, "CONFIG_PATH", tmp_path / "upcoming_bills.yaml")
+
+        rent = Bill(name="Hyra", amount=Decimal("8500"),
+                    due_date=datetime(2031, 1, 31).date(), category="Boende")
+        power = Bill(name="El", amount=Decimal("900"),
+                     due_date=datetime(2031, 2, 28).date(), category="Boende")
+        upcoming_bills.add_bill(rent)
+        upcoming_bills.add_bill(power)
+
+        assert [b.name for b in upcoming_bills.get_upcoming_bills("2031-01")] == ["Hyra"]
+        assert [b.name for b in upcoming_bills.get_upcoming_bills("2031-02")] == ["El"]
+        assert upcoming_bills.get_upcoming_bills("2031-03") == []
+
+        # Flytta hyran till februari; fakturan behåller sin plats i filen
+        moved = Bill(name="Hyra", amount=Decimal("8500"),
+                     due_date=datetime(2031, 2, 1).date(), category="Boende")
+        assert upcoming_bills.update_bill("Hyra", "2031-01-31", moved)
+
+        assert upcoming_bills.get_upcoming_bills("2031-01") == []
+        assert [b.name for b in upcoming_bills.get_upcoming_bills("2031-02")] == ["Hyra", "El"]
+
+        assert upcoming_bills.delete_bill("El", "2031-02-28")
+        assert [b.name for b in upcoming_bills.get_all_bills()] == ["Hyra"]